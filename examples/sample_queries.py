@@ -13,42 +13,43 @@ Or import specific examples:
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SampleQuery:
-    """Represents a sample query with metadata."""
+    """Represents an immutable sample query with metadata."""
 
     name: str
     query: str
     category: str
     description: str
-    expected_tools: list[str]
+    expected_tools: tuple[str, ...]
 
 
 # Sample queries organized by category
-SAMPLE_QUERIES: list[SampleQuery] = [
+SAMPLE_QUERIES: tuple[SampleQuery, ...] = (
     # Basic Calculations
     SampleQuery(
         name="escape_velocity",
         query="Calculate the escape velocity from Earth",
         category="calculation",
         description="Uses code executor to compute v = sqrt(2GM/R)",
-        expected_tools=["code_executor"],
+        expected_tools=("code_executor",),
     ),
     SampleQuery(
         name="schwarzschild_radius",
         query="What is the Schwarzschild radius of a 10 solar mass black hole?",
         category="calculation",
         description="Calculates the event horizon radius using Rs = 2GM/c^2",
-        expected_tools=["code_executor"],
+        expected_tools=("code_executor",),
     ),
     SampleQuery(
         name="orbital_period",
         query="Calculate the orbital period of Mars around the Sun",
         category="calculation",
         description="Uses Kepler's third law: T = 2*pi*sqrt(a^3/GM)",
-        expected_tools=["code_executor"],
+        expected_tools=("code_executor",),
     ),
 
     # Orbital Mechanics
@@ -57,21 +58,21 @@ SAMPLE_QUERIES: list[SampleQuery] = [
         query="Simulate the trajectory of a spacecraft from Earth to Mars using a Hohmann transfer orbit",
         category="orbital_mechanics",
         description="Calculates transfer orbit parameters and delta-v requirements",
-        expected_tools=["code_executor", "plotter"],
+        expected_tools=("code_executor", "plotter"),
     ),
     SampleQuery(
         name="exoplanet_orbit",
         query="Plot the orbit of an exoplanet with 2x Earth mass at 1.5 AU from its star",
         category="orbital_mechanics",
         description="Generates orbital visualization using Kepler's laws",
-        expected_tools=["code_executor", "plotter"],
+        expected_tools=("code_executor", "plotter"),
     ),
     SampleQuery(
         name="satellite_velocity",
         query="What is the orbital velocity of a satellite in low Earth orbit at 400 km altitude?",
         category="orbital_mechanics",
         description="Calculates circular orbital velocity at specified altitude",
-        expected_tools=["code_executor"],
+        expected_tools=("code_executor",),
     ),
 
     # Research Questions
@@ -80,21 +81,21 @@ SAMPLE_QUERIES: list[SampleQuery] = [
         query="What are the latest discoveries about supermassive black holes?",
         category="research",
         description="Searches scientific sources for recent black hole research",
-        expected_tools=["web_search"],
+        expected_tools=("web_search",),
     ),
     SampleQuery(
         name="dark_matter",
         query="What is dark matter and what evidence do we have for its existence?",
         category="research",
         description="Retrieves information about dark matter from knowledge base",
-        expected_tools=["wikipedia", "web_search"],
+        expected_tools=("wikipedia", "web_search"),
     ),
     SampleQuery(
         name="gravitational_waves",
         query="How do LIGO and Virgo detect gravitational waves?",
         category="research",
         description="Explains gravitational wave detection methods",
-        expected_tools=["wikipedia", "web_search"],
+        expected_tools=("wikipedia", "web_search"),
     ),
 
     # Cosmology Topics
@@ -103,23 +104,23 @@ SAMPLE_QUERIES: list[SampleQuery] = [
         query="What is the temperature of the cosmic microwave background and why is it significant?",
         category="cosmology",
         description="Explains CMB temperature and cosmological implications",
-        expected_tools=["wikipedia"],
+        expected_tools=("wikipedia",),
     ),
     SampleQuery(
         name="hubble_constant",
         query="What is the Hubble constant and why is there tension in its measurements?",
         category="cosmology",
         description="Discusses the Hubble tension between different measurement methods",
-        expected_tools=["wikipedia", "web_search"],
+        expected_tools=("wikipedia", "web_search"),
     ),
     SampleQuery(
         name="expansion_rate",
         query="Calculate the age of the universe given a Hubble constant of 70 km/s/Mpc",
         category="cosmology",
         description="Computes Hubble time as an approximation of universe age",
-        expected_tools=["code_executor"],
+        expected_tools=("code_executor",),
     ),
-]
+)
 
 
 # Categorized query sets for different use cases
@@ -129,6 +130,12 @@ RESEARCH_QUERIES = [q for q in SAMPLE_QUERIES if q.category == "research"]
 COSMOLOGY_QUERIES = [q for q in SAMPLE_QUERIES if q.category == "cosmology"]
 
 
+@lru_cache(maxsize=None)
+def _query_index() -> dict[str, SampleQuery]:
+    """Build the name -> query index once; SAMPLE_QUERIES is immutable."""
+    return {q.name: q for q in SAMPLE_QUERIES}
+
+
 def get_query_by_name(name: str) -> SampleQuery | None:
     """Get a sample query by its name.
 
@@ -138,10 +145,7 @@ def get_query_by_name(name: str) -> SampleQuery | None:
     Returns:
         The SampleQuery object if found, None otherwise
     """
-    for query in SAMPLE_QUERIES:
-        if query.name == name:
-            return query
-    return None
+    return _query_index().get(name)
 
 
 def get_queries_by_category(category: str) -> list[SampleQuery]:
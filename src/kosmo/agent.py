@@ -1,20 +1,30 @@
 """ReAct agent for cosmology research."""
 
-import copy
 import os
 import time
-import uuid
-from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 from langchain_core.tools import Tool
-from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.prebuilt import create_react_agent
 
 from .errors import ErrorHandler, classify_error, is_transient_error
 from .prompts import REACT_SYSTEM_PROMPT, enhance_prompt_for_topic
 from .tools import create_plot, execute_code, search_wikipedia, web_search
+from .utils import new_thread_id
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.memory import InMemorySaver
+
+# LangChain's OpenAI client and LangGraph take ~2 s to import, so they are
+# loaded on first use by _load_langchain(). Agent construction, --help and
+# --version never pay for them.
+ChatOpenAI = None
+create_react_agent = None
 
 # Load environment variables
 load_dotenv()
@@ -28,6 +38,13 @@ MAX_RETRIES = 3
 # Delay between retries (seconds)
 RETRY_DELAY = 1.0
 
+# Transcripts kept for threads other than the current one; the least
+# recently used are dropped beyond this
+MAX_KEPT_TRANSCRIPTS = 100
+
+# Invoke config for agents without session memory; never mutated
+_NO_MEMORY_CONFIG = {"recursion_limit": MAX_ITERATIONS * 2}
+
 # Keywords indicating incomplete or failed results
 INCOMPLETE_INDICATORS = [
     "error:",
@@ -42,6 +59,17 @@ INCOMPLETE_INDICATORS = [
 ]
 
 
+def _load_langchain() -> None:
+    """Import the LLM client and agent factory if not already loaded."""
+    global ChatOpenAI, create_react_agent
+    if ChatOpenAI is None:
+        from langchain_openai import ChatOpenAI as chat_openai
+        ChatOpenAI = chat_openai
+    if create_react_agent is None:
+        from langgraph.prebuilt import create_react_agent as react_agent_factory
+        create_react_agent = react_agent_factory
+
+
 def _is_result_incomplete(result: str) -> bool:
     """Check if a tool result indicates failure or incomplete data.
 
@@ -92,22 +120,31 @@ def _wrap_tool_with_retry(tool_func, max_retries: int = MAX_RETRIES):
     return wrapped_func
 
 
-def create_tools(with_retry: bool = True) -> List[Tool]:
+def create_tools(with_retry: bool = True) -> Tuple[Tool, ...]:
     """Create the tool list for the agent.
 
+    Tools are stateless, so each variant is built once per process and
+    the same immutable tuple is shared by every agent.
+
     Args:
         with_retry: Whether to wrap tools with retry logic (default: True)
 
     Returns:
-        List of Tool objects for the agent
+        Tuple of Tool objects for the agent
     """
+    return _build_tools(bool(with_retry))
+
+
+@lru_cache(maxsize=None)
+def _build_tools(with_retry: bool) -> Tuple[Tool, ...]:
+    """Build the tools once per retry setting (see create_tools)."""
     # Optionally wrap tool functions with retry logic
     ws_func = _wrap_tool_with_retry(web_search) if with_retry else web_search
     ec_func = _wrap_tool_with_retry(execute_code) if with_retry else execute_code
     sw_func = _wrap_tool_with_retry(search_wikipedia) if with_retry else search_wikipedia
     cp_func = _wrap_tool_with_retry(create_plot) if with_retry else create_plot
 
-    return [
+    return (
         Tool(
             name="web_search",
             func=ws_func,
@@ -128,7 +165,51 @@ def create_tools(with_retry: bool = True) -> List[Tool]:
             func=cp_func,
             description="Generate visualizations using Matplotlib. Input should be Python code that creates a matplotlib figure using plt."
         ),
-    ]
+    )
+
+
+@dataclass
+class SessionInfo(Mapping):
+    """Metadata tracked for a single conversation thread.
+
+    Slotted so each session costs a few pointers rather than a dict. It
+    also reads like the mapping it replaced (``info["query_count"]``).
+    Timestamps are kept as integer nanoseconds from ``time.time_ns()`` and
+    only turned into float seconds when read. ``messages`` holds the
+    transcript while the thread is not the agent's current one.
+    """
+
+    __slots__ = ("created_ns", "last_query_ns", "query_count", "messages")
+
+    _KEYS = ("created_at", "last_query_at", "query_count")
+
+    created_ns: int
+    last_query_ns: int
+    query_count: int
+
+    def __post_init__(self):
+        self.messages: Optional[List] = None
+
+    @property
+    def created_at(self) -> float:
+        """Session creation time in seconds since the epoch."""
+        return self.created_ns / 1e9
+
+    @property
+    def last_query_at(self) -> float:
+        """Time of the latest query in seconds since the epoch."""
+        return self.last_query_ns / 1e9
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
 
 
 class KosmoAgent:
@@ -160,15 +241,16 @@ class KosmoAgent:
         self.enable_memory = enable_memory
         self.graceful_degradation = graceful_degradation
         self.messages: List = []
-        # Cache agents by prompt to avoid recreating for same topic
+        # Compiled agents keyed by (prompt, enable_memory, with_tool_retry)
         self._agents: dict = {}
         self._llm = None
-        self._tools = None
         # Session memory using LangGraph checkpointer
-        self._checkpointer: Optional[InMemorySaver] = None
-        self._current_thread_id: str = str(uuid.uuid4())
+        self._checkpointer: Optional["InMemorySaver"] = None
+        self._current_thread_id: str = new_thread_id()
         # Store session metadata (thread_id -> session info)
-        self._sessions: Dict[str, dict] = {}
+        self._sessions: Dict[str, SessionInfo] = {}
+        # Sessions holding a transcript, least recently used first
+        self._kept_transcripts: "OrderedDict[str, SessionInfo]" = OrderedDict()
         # Error handling
         self._error_handler = ErrorHandler(verbose=verbose)
         self._failed_tools: Set[str] = set()
@@ -180,6 +262,7 @@ class KosmoAgent:
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not found in environment variables")
 
+            _load_langchain()
             self._llm = ChatOpenAI(
                 model="gpt-4o-mini",
                 temperature=0,
@@ -188,47 +271,62 @@ class KosmoAgent:
         return self._llm
 
     def _get_tools(self):
-        """Get or create the tools list."""
-        if self._tools is None:
-            self._tools = create_tools(with_retry=self.with_tool_retry)
-        return self._tools
+        """Get the shared tool set for the current retry setting."""
+        return create_tools(with_retry=self.with_tool_retry)
 
-    def _get_checkpointer(self) -> Optional[InMemorySaver]:
+    def _get_checkpointer(self) -> Optional["InMemorySaver"]:
         """Get or create the checkpointer for session memory.
 
+        Each agent owns its checkpointer, so callers that pick their own
+        thread IDs never see another agent's history, and the history is
+        freed with the agent. Only called when ``_get_agent`` builds a new
+        graph, so it stays off the per-query path.
+
         Returns:
             InMemorySaver instance if memory is enabled, None otherwise
         """
         if not self.enable_memory:
             return None
         if self._checkpointer is None:
+            from langgraph.checkpoint.memory import InMemorySaver
             self._checkpointer = InMemorySaver()
         return self._checkpointer
 
     def _get_agent(self, system_prompt: str):
         """Get or create the ReAct agent for a given system prompt.
 
+        The compiled graph depends only on the prompt, the tool set and the
+        checkpointer, so it is built once and reused across queries. Changing
+        ``enable_memory`` or ``with_tool_retry`` selects a fresh graph.
+
         Args:
             system_prompt: The system prompt to use for the agent
 
         Returns:
             The ReAct agent instance
         """
-        # Use prompt as cache key
-        if system_prompt not in self._agents:
+        key = (system_prompt, self.enable_memory, self.with_tool_retry)
+        agent = self._agents.get(key)
+        if agent is None:
+            _load_langchain()
             llm = self._get_llm()
             tools = self._get_tools()
             checkpointer = self._get_checkpointer()
 
             # Create ReAct agent using langgraph with optional checkpointer
-            self._agents[system_prompt] = create_react_agent(
+            agent = create_react_agent(
                 llm,
                 tools,
                 prompt=system_prompt,
                 checkpointer=checkpointer
             )
+            self._agents[key] = agent
 
-        return self._agents[system_prompt]
+        return agent
+
+    def reset_agent_cache(self):
+        """Drop all compiled agents so the next query rebuilds them."""
+        self._agents.clear()
 
     def _check_response_complete(self, response: str) -> Tuple[bool, Optional[str]]:
         """Check if the agent's response is complete or needs retry.
@@ -286,28 +384,35 @@ class KosmoAgent:
         # Use provided thread_id or current thread
         effective_thread_id = thread_id or self._current_thread_id
 
-        # Track session
-        if effective_thread_id not in self._sessions:
-            self._sessions[effective_thread_id] = {
-                "created_at": time.time(),
-                "query_count": 0
+        # Track session (one lookup, plus one insert for a new thread)
+        now = time.time_ns()
+        session = self._sessions.get(effective_thread_id)
+        if session is None:
+            session = SessionInfo(created_ns=now, last_query_ns=now, query_count=0)
+            self._sessions[effective_thread_id] = session
+        session.query_count += 1
+        session.last_query_ns = now
+
+        # Add user message to the thread's history (for legacy compatibility)
+        history = self._get_history(effective_thread_id, session)
+        history.append({"role": "user", "content": question})
+
+        # Config with recursion limit and thread_id for memory, built once
+        # per query and shared by its retries. It is never stored on self,
+        # so concurrent queries cannot swap each other's thread_id.
+        if self.enable_memory:
+            config = {
+                "recursion_limit": MAX_ITERATIONS * 2,
+                "configurable": {"thread_id": effective_thread_id},
             }
-        self._sessions[effective_thread_id]["query_count"] += 1
-        self._sessions[effective_thread_id]["last_query_at"] = time.time()
-
-        # Add user message to history (for legacy compatibility)
-        self.messages.append({"role": "user", "content": question})
+        else:
+            config = _NO_MEMORY_CONFIG
 
         last_response = "No response generated."
         current_message = question
 
         for attempt in range(self.max_retries):
             try:
-                # Build config with recursion limit and thread_id for memory
-                config = {"recursion_limit": MAX_ITERATIONS * 2}
-                if self.enable_memory:
-                    config["configurable"] = {"thread_id": effective_thread_id}
-
                 result = agent.invoke(
                     {"messages": [{"role": "user", "content": current_message}]},
                     config=config
@@ -319,7 +424,8 @@ class KosmoAgent:
 
                 if response:
                     # Store the updated message history
-                    self.messages = output_messages
+                    history = output_messages
+                    self._set_history(effective_thread_id, session, history)
                     if self.verbose:
                         self._print_steps(output_messages)
 
@@ -344,7 +450,7 @@ class KosmoAgent:
                         # Set the next message to be a retry prompt with fallback suggestions
                         retry_message = self._build_retry_message(retry_reason)
                         current_message = retry_message
-                        self.messages.append({"role": "user", "content": retry_message})
+                        history.append({"role": "user", "content": retry_message})
                         time.sleep(RETRY_DELAY)
                         continue
 
@@ -368,6 +474,38 @@ class KosmoAgent:
 
         return self._format_degraded_response(last_response)
 
+    def _get_history(self, thread_id: str, session: SessionInfo) -> List:
+        """Get the message history a query on ``thread_id`` appends to.
+
+        The current thread's history is ``self.messages``; any other thread
+        keeps its own on its SessionInfo.
+        """
+        if thread_id == self._current_thread_id:
+            return self.messages
+        if session.messages is None:
+            self._keep_transcript(thread_id, session, [])
+        return session.messages
+
+    def _set_history(self, thread_id: str, session: SessionInfo, messages: List) -> None:
+        """Replace the message history of ``thread_id``."""
+        if thread_id == self._current_thread_id:
+            self.messages = messages
+        else:
+            self._keep_transcript(thread_id, session, messages)
+
+    def _keep_transcript(self, thread_id: str, session: SessionInfo, messages: List) -> None:
+        """Keep ``messages`` as the transcript of a thread that is not current.
+
+        Only ``MAX_KEPT_TRANSCRIPTS`` are kept; the least recently used is
+        dropped to make room.
+        """
+        session.messages = messages
+        self._kept_transcripts[thread_id] = session
+        self._kept_transcripts.move_to_end(thread_id)
+        while len(self._kept_transcripts) > MAX_KEPT_TRANSCRIPTS:
+            _, evicted = self._kept_transcripts.popitem(last=False)
+            evicted.messages = None
+
     def _build_retry_message(self, retry_reason: Optional[str]) -> str:
         """Build a retry message based on the failure reason.
 
@@ -539,15 +677,29 @@ class KosmoAgent:
         """Start a new conversation session.
 
         Creates a new thread ID for session memory, allowing a fresh
-        conversation without prior context.
+        conversation without prior context. The outgoing session keeps the
+        transcript for ``get_session_messages``; the list is handed over
+        rather than copied. Up to ``MAX_KEPT_TRANSCRIPTS`` transcripts are
+        kept, and ``drop_session_messages`` frees one early.
 
         Returns:
             The new thread ID for the session
         """
-        self._current_thread_id = str(uuid.uuid4())
-        self.messages = []
+        self._switch_thread(new_thread_id())
         return self._current_thread_id
 
+    def _switch_thread(self, thread_id: str) -> None:
+        """Make ``thread_id`` current, swapping its transcript into ``self.messages``."""
+        outgoing = self._sessions.get(self._current_thread_id)
+        if outgoing is not None:
+            self._keep_transcript(self._current_thread_id, outgoing, self.messages)
+        self._current_thread_id = thread_id
+        self.messages = []
+        incoming = self._kept_transcripts.pop(thread_id, None)
+        if incoming is not None:
+            self.messages = incoming.messages
+            incoming.messages = None
+
     def get_current_thread_id(self) -> str:
         """Get the current thread ID for session tracking.
 
@@ -559,27 +711,86 @@ class KosmoAgent:
     def set_thread_id(self, thread_id: str) -> None:
         """Set the current thread ID to continue a previous session.
 
+        The outgoing thread's history is kept as for ``new_session``, and
+        the resumed thread's kept history, if any, becomes ``self.messages``.
+
         Args:
             thread_id: The thread ID to resume
         """
-        self._current_thread_id = thread_id
+        self._switch_thread(thread_id)
 
-    def get_session_info(self, thread_id: Optional[str] = None) -> Optional[dict]:
+    def get_session_info(self, thread_id: Optional[str] = None) -> Optional[SessionInfo]:
         """Get information about a session.
 
         Args:
             thread_id: The thread ID to look up. Uses current thread if not provided.
 
         Returns:
-            Session info dict or None if session not found
+            SessionInfo for the thread, or None if session not found
         """
-        tid = thread_id or self._current_thread_id
-        return self._sessions.get(tid)
+        return self._sessions.get(thread_id or self._current_thread_id)
 
-    def list_sessions(self) -> Dict[str, dict]:
+    def list_sessions(self) -> Mapping[str, SessionInfo]:
         """List all tracked sessions.
 
         Returns:
-            Dictionary mapping thread IDs to session info (deep copy)
+            Read-only live view mapping thread IDs to session info. The view
+            rejects writes, and SessionInfo rejects item assignment.
         """
-        return copy.deepcopy(self._sessions)
+        return MappingProxyType(self._sessions)
+
+    def session_count(self) -> int:
+        """Get the number of tracked sessions.
+
+        Returns:
+            Number of threads that have received at least one query
+        """
+        return len(self._sessions)
+
+    def get_session_query_count(self, thread_id: Optional[str] = None) -> int:
+        """Get how many queries a session has handled.
+
+        Args:
+            thread_id: The thread ID to look up. Uses current thread if not provided.
+
+        Returns:
+            Query count for the thread, or 0 if session not found
+        """
+        session = self._sessions.get(thread_id or self._current_thread_id)
+        return session.query_count if session is not None else 0
+
+    def get_session_messages(self, thread_id: Optional[str] = None) -> List:
+        """Get the message history of a session.
+
+        Args:
+            thread_id: The thread ID to look up. Uses current thread if not provided.
+
+        Returns:
+            The live history for the current thread, the kept transcript for
+            any other thread, or an empty list if none was kept. The list is
+            shared, not copied; do not modify it.
+        """
+        if thread_id is None or thread_id == self._current_thread_id:
+            return self.messages
+        session = self._sessions.get(thread_id)
+        if session is None or session.messages is None:
+            return []
+        return session.messages
+
+    def drop_session_messages(self, thread_id: str) -> bool:
+        """Drop the kept transcript of a thread that is not current.
+
+        Session info and the checkpointer's state are left in place; use
+        ``clear_memory`` for the current thread.
+
+        Args:
+            thread_id: The thread ID whose transcript to drop
+
+        Returns:
+            True if a transcript was dropped, False if none was kept
+        """
+        session = self._kept_transcripts.pop(thread_id, None)
+        if session is None:
+            return False
+        session.messages = None
+        return True
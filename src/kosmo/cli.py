@@ -1,6 +1,7 @@
 """Command-line interface for Kosmo - Cosmology Research Agent."""
 
 import argparse
+import os
 import sys
 
 from . import __version__
@@ -51,6 +52,7 @@ def run_interactive(verbose: bool = True):
         verbose: Whether to show intermediate reasoning steps
     """
     from .agent import KosmoAgent
+    from .warmup import start_warmup
 
     print_banner()
 
@@ -61,6 +63,9 @@ def run_interactive(verbose: bool = True):
         print("Please set your OPENAI_API_KEY environment variable.")
         sys.exit(1)
 
+    # Pre-import heavy agent and tool dependencies while the user types
+    start_warmup()
+
     while True:
         try:
             # Get user input
@@ -122,6 +127,7 @@ Examples:
   kosmo "What is dark matter?"             # Single query
   kosmo -q "Calculate escape velocity"     # Single query with -q flag
   kosmo --quiet "Explain black holes"      # Single query without verbose output
+  kosmo --no-cache "What is dark matter?"  # Bypass the Wikipedia result cache
 """
     )
 
@@ -143,6 +149,12 @@ Examples:
         help="Suppress intermediate reasoning output"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the persistent Wikipedia result cache"
+    )
+
     parser.add_argument(
         "-v", "--version",
         action="version",
@@ -155,6 +167,9 @@ Examples:
     query = args.query or args.query_flag
     verbose = not args.quiet
 
+    if args.no_cache:
+        os.environ["KOSMO_NO_CACHE"] = "1"
+
     if query:
         # Single query mode
         try:
@@ -1,8 +1,8 @@
 """Kosmo tools for the ReAct agent."""
 
 from .code_executor import execute_code
-from .knowledge_base import search_wikipedia
+from .knowledge_base import search_wikipedia, search_wikipedia_many
 from .plotter import create_plot
 from .web_search import web_search
 
-__all__ = ["web_search", "execute_code", "search_wikipedia", "create_plot"]
+__all__ = ["web_search", "execute_code", "search_wikipedia", "search_wikipedia_many", "create_plot"]
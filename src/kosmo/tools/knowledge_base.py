@@ -1,29 +1,207 @@
 """Knowledge base tool using Wikipedia API."""
 
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
+try:
+    import orjson
+    # orjson parses the raw bytes directly and raises a ValueError subclass
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-def search_wikipedia(query: str, sentences: int = 5) -> str:
+SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+SEARCH_URL = "https://en.wikipedia.org/w/api.php"
+HEADERS = {"User-Agent": "Kosmo/1.0 (Cosmology Research Agent)"}
+
+# Maximum concurrent Wikipedia requests for batched lookups
+MAX_CONCURRENT_REQUESTS = 8
+
+# Persistent result cache shared across runs (disable with KOSMO_NO_CACHE=1)
+CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "kosmo",
+    "wikipedia",
+)
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 10000
+
+# Sentence boundary: terminal punctuation, whitespace, then a sentence start.
+# Leading with the punctuation class (not a lookbehind) lets the regex engine
+# skip ahead to candidate characters, roughly halving scan time.
+_SENT_RE = re.compile(r'[.!?]\s+(?=[A-Z0-9"])')
+
+# Abbreviations whose trailing period does not end a sentence
+_ABBREV_RE = re.compile(r"\b(?:Dr|Mr|Mrs|Ms|Prof|Sr|Jr|St|Fig|No|vs|etc|approx|e\.g|i\.e)\.$")
+
+
+class DiskCache:
+    """Persistent key/value store with per-entry expiry, backed by SQLite.
+
+    Each operation opens its own connection, so one instance can be shared
+    between threads and several processes can point at the same directory.
+    """
+
+    def __init__(self, directory: str, max_entries: int = CACHE_MAX_ENTRIES):
+        """Create (or reopen) the cache stored in ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "cache.sqlite3")
+        self.max_entries = max_entries
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, expire: float = CACHE_TTL_SECONDS) -> None:
+        """Store ``value`` under ``key`` for ``expire`` seconds."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + expire),
+            )
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            # Evict the entries closest to expiry once over capacity
+            conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM cache")
+
+
+_cache: Optional[DiskCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> Optional[DiskCache]:
+    """Get or create the shared result cache, or None when caching is off.
+
+    A cache directory that cannot be set up is not retried on every call.
+    """
+    global _cache, _cache_failed
+    if os.getenv("KOSMO_NO_CACHE") or _cache_failed:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                try:
+                    _cache = DiskCache(CACHE_DIR)
+                except (OSError, sqlite3.Error):
+                    _cache_failed = True
+    return _cache
+
+
+# Lookups currently on the wire, so identical concurrent queries share one request
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def search_wikipedia(query: str, sentences: int = 5, use_cache: bool = True) -> str:
     """
     Search Wikipedia for scientific facts and definitions.
 
+    Successful lookups are cached on disk for ``CACHE_TTL_SECONDS`` so they
+    survive agent restarts.
+
     Args:
         query: The search term or topic
         sentences: Number of sentences to return from the summary (default: 5)
+        use_cache: Whether to read and write the persistent cache (default: True)
 
     Returns:
         Wikipedia summary or error message
     """
-    base_url = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+    cache = _get_cache() if use_cache else None
+    key = f"{sentences}:{query}"
+
+    if cache is not None:
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            return cached
+
+    return _fetch_coalesced(key, query, sentences, cache)
+
+
+def _fetch_coalesced(
+    key: str, query: str, sentences: int, cache: Optional[DiskCache]
+) -> str:
+    """Fetch a summary, joining an identical request already in flight.
+
+    Only the caller that made the request writes a successful result to
+    ``cache``; errors, "not found" and disambiguation notices are left
+    uncached so the next lookup tries again.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[key] = Future()
+
+    if not is_owner:
+        return future.result()
 
+    try:
+        result, ok = _fetch_summary(query, sentences)
+        if ok and cache is not None:
+            try:
+                cache.set(key, result)
+            except sqlite3.Error:
+                pass
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def _fetch_summary(query: str, sentences: int) -> Tuple[str, bool]:
+    """Fetch a formatted summary for ``query`` from the Wikipedia API.
+
+    Returns:
+        The summary or error message, and whether it is a summary
+    """
     # Clean query for URL
     search_term = query.replace(" ", "_")
 
     try:
         response = requests.get(
-            f"{base_url}{search_term}",
-            headers={"User-Agent": "Kosmo/1.0 (Cosmology Research Agent)"},
+            f"{SUMMARY_URL}{search_term}",
+            headers=HEADERS,
             timeout=10
         )
 
@@ -32,67 +210,122 @@ def search_wikipedia(query: str, sentences: int = 5) -> str:
             return _search_and_get_summary(query, sentences)
 
         if response.status_code != 200:
-            return f"Error: Wikipedia API returned status {response.status_code}"
+            return f"Error: Wikipedia API returned status {response.status_code}", False
 
-        data = response.json()
+        data = _json_loads(response.content)
 
         if data.get("type") == "disambiguation":
-            return f"'{query}' is ambiguous. Please be more specific. Related topics: {data.get('extract', 'N/A')}"
+            return f"'{query}' is ambiguous. Please be more specific. Related topics: {data.get('extract', 'N/A')}", False
 
         title = data.get("title", query)
         extract = data.get("extract", "No summary available.")
         url = data.get("content_urls", {}).get("desktop", {}).get("page", "")
 
-        # Truncate to requested sentences
-        sentences_list = extract.split(". ")
-        if len(sentences_list) > sentences:
-            extract = ". ".join(sentences_list[:sentences]) + "."
-
-        result = f"**{title}**\n\n{extract}"
-        if url:
-            result += f"\n\nSource: {url}"
-
-        return result
+        return _format_summary(title, extract, url, sentences), True
 
     except requests.exceptions.Timeout:
-        return "Error: Wikipedia request timed out."
+        return "Error: Wikipedia request timed out.", False
     except requests.exceptions.RequestException as e:
-        return f"Error accessing Wikipedia: {str(e)}"
+        return f"Error accessing Wikipedia: {str(e)}", False
     except Exception as e:
-        return f"Error processing Wikipedia response: {str(e)}"
+        return f"Error processing Wikipedia response: {str(e)}", False
+
+
+def search_wikipedia_many(queries: List[str], sentences: int = 5) -> List[str]:
+    """
+    Look up several Wikipedia topics concurrently.
 
+    Args:
+        queries: The search terms or topics
+        sentences: Number of sentences to return from each summary (default: 5)
 
-def _search_and_get_summary(query: str, sentences: int) -> str:
-    """Search Wikipedia and get summary of the best match."""
-    search_url = "https://en.wikipedia.org/w/api.php"
+    Returns:
+        List of summaries or error messages, in the same order as ``queries``
+    """
+    if not queries:
+        return []
 
+    workers = min(MAX_CONCURRENT_REQUESTS, len(queries))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda q: search_wikipedia(q, sentences), queries))
+
+
+def _format_summary(title: str, extract: str, url: str, sentences: int) -> str:
+    """Format a Wikipedia summary, truncated to the requested sentence count."""
+    extract = _take_sentences(extract, sentences)
+
+    result = f"**{title}**\n\n{extract}"
+    if url:
+        result += f"\n\nSource: {url}"
+
+    return result
+
+
+def _take_sentences(text: str, n: int) -> str:
+    """Return the first ``n`` sentences of ``text``.
+
+    Scans boundaries lazily and stops at the ``n``-th one, so long extracts
+    are never split into a full sentence list. Returns an empty string
+    when ``n`` is zero or negative.
+    """
+    if n <= 0:
+        return ""
+    count = 0
+    for match in _SENT_RE.finditer(text):
+        end = match.start() + 1  # Keep the terminal punctuation
+        if _ABBREV_RE.search(text, max(0, end - 8), end):
+            continue
+        count += 1
+        if count >= n:
+            return text[:end]
+    return text
+
+
+def _search_and_get_summary(query: str, sentences: int) -> Tuple[str, bool]:
+    """Search Wikipedia and get summary of the best match.
+
+    Uses ``generator=search`` so the search hit and its intro extract come
+    back in a single request instead of a search call plus a summary call.
+
+    Returns:
+        The summary or error message, and whether it is a summary
+    """
     try:
-        # Search for the query
         search_response = requests.get(
-            search_url,
+            SEARCH_URL,
             params={
                 "action": "query",
-                "list": "search",
-                "srsearch": query,
+                "generator": "search",
+                "gsrsearch": query,
+                "gsrlimit": 1,
+                "prop": "extracts|info",
+                "exintro": 1,
+                "explaintext": 1,
+                "exsentences": sentences,
+                "inprop": "url",
                 "format": "json",
-                "srlimit": 3
+                "formatversion": 2,
             },
-            headers={"User-Agent": "Kosmo/1.0 (Cosmology Research Agent)"},
+            headers=HEADERS,
             timeout=10
         )
 
         if search_response.status_code != 200:
-            return f"Error: Wikipedia search returned status {search_response.status_code}"
+            return f"Error: Wikipedia search returned status {search_response.status_code}", False
+
+        search_data = _json_loads(search_response.content)
+        pages = search_data.get("query", {}).get("pages", [])
 
-        search_data = search_response.json()
-        results = search_data.get("query", {}).get("search", [])
+        if not pages:
+            return f"No Wikipedia articles found for: {query}", False
 
-        if not results:
-            return f"No Wikipedia articles found for: {query}"
+        # Best match is the page with the lowest search index
+        page = min(pages, key=lambda p: p.get("index", 0))
+        title = page.get("title", query)
+        extract = page.get("extract") or "No summary available."
+        url = page.get("fullurl", "")
 
-        # Get summary of first result
-        first_result = results[0]["title"]
-        return search_wikipedia(first_result, sentences)
+        return _format_summary(title, extract, url, sentences), True
 
     except Exception as e:
-        return f"Error searching Wikipedia: {str(e)}"
+        return f"Error searching Wikipedia: {str(e)}", False
@@ -1,38 +1,55 @@
 """Plotting tool using Matplotlib."""
 
+import builtins
+import hashlib
 import io
+import marshal
+import multiprocessing
 import os
 import traceback
+import types
 import uuid
+from collections import OrderedDict
 from contextlib import redirect_stderr, redirect_stdout
+from typing import Tuple
 
+try:
+    import resource
+    ISOLATION_AVAILABLE = "forkserver" in multiprocessing.get_all_start_methods()
+except ImportError:
+    ISOLATION_AVAILABLE = False
 
-def create_plot(code: str, output_dir: str = "outputs") -> str:
-    """
-    Generate a visualization using Matplotlib.
+try:
+    import matplotlib
+    import numpy as np
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
+    from matplotlib import _pylab_helpers, font_manager
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    PLOTTING_AVAILABLE = True
+    _IMPORT_ERROR = None
+except ImportError as e:
+    PLOTTING_AVAILABLE = False
+    _IMPORT_ERROR = e
 
-    The code should create a matplotlib figure. The function will automatically
-    save it and return the filename.
 
-    Args:
-        code: Python code that creates a matplotlib figure
-        output_dir: Directory to save plots (default: "outputs")
+def _warm_font_cache() -> None:
+    """Build matplotlib's font cache up front.
 
-    Returns:
-        Path to the saved plot or error message
+    The first text render in a fresh process otherwise pays a 1-3s font
+    scan, which would land on the agent's first create_plot call.
     """
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    font_manager.findfont(font_manager.FontProperties(family=["sans-serif"]))
 
-    # Generate unique filename
-    filename = f"plot_{uuid.uuid4().hex[:8]}.png"
-    filepath = os.path.join(output_dir, filename)
 
-    # Create isolated namespace
-    namespace = {"__builtins__": {}}
+if PLOTTING_AVAILABLE:
+    _warm_font_cache()
 
-    # Add safe builtins
-    safe_builtins = [
+# Builtins exposed to plotting code
+_SAFE_BUILTINS = types.MappingProxyType({
+    name: getattr(builtins, name)
+    for name in [
         "abs", "all", "any", "bin", "bool", "chr", "dict", "divmod",
         "enumerate", "filter", "float", "format", "frozenset", "hex",
         "int", "isinstance", "issubclass", "iter", "len", "list",
@@ -40,33 +57,276 @@ def create_plot(code: str, output_dir: str = "outputs") -> str:
         "range", "repr", "reversed", "round", "set", "slice", "sorted",
         "str", "sum", "tuple", "type", "zip"
     ]
+})
+
+# Modules and physics constants every plotting namespace starts with
+_SANDBOX_TEMPLATE = types.MappingProxyType({
+    "np": np,
+    "numpy": np,
+    "matplotlib": matplotlib,
+    # Physics constants
+    "G": 6.67430e-11,
+    "c": 299792458,
+    "M_sun": 1.989e30,
+    "M_earth": 5.972e24,
+    "R_earth": 6.371e6,
+    "AU": 1.496e11,
+    "pi": np.pi,
+} if PLOTTING_AVAILABLE else {})
+
+# Resource limits for the isolated plotting process
+PLOT_CPU_SECONDS = 5
+PLOT_MEMORY_BYTES = 512 * 1024 * 1024  # On top of the inherited address space
+PLOT_FILE_BYTES = 10 * 1024 * 1024
+
+# zlib level for saved PNGs: 1 encodes fastest at the cost of larger files
+PNG_COMPRESS_LEVEL = 1
+
+# Maximum number of compiled plotting snippets kept in memory
+CODE_CACHE_SIZE = 256
+
+# Compiled plotting code keyed by source digest, least recently used first
+_CODE_CACHE: "OrderedDict[bytes, types.CodeType]" = OrderedDict()
+
+
+def _compile_cached(code: str) -> types.CodeType:
+    """Compile plotting code, reusing the code object for repeated sources.
+
+    Raises:
+        SyntaxError: If the code does not compile (failures are not cached)
+    """
+    key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    compiled = _CODE_CACHE.get(key)
+    if compiled is not None:
+        _CODE_CACHE.move_to_end(key)
+        return compiled
+
+    compiled = compile(code, "<plot_code>", "exec")
+    _CODE_CACHE[key] = compiled
+    if len(_CODE_CACHE) > CODE_CACHE_SIZE:
+        _CODE_CACHE.popitem(last=False)
+    return compiled
+
+
+# pyplot functions that map one-to-one onto a method of the current Axes
+_AXES_METHODS = frozenset({
+    "annotate", "arrow", "axhline", "axhspan", "axis", "axvline", "axvspan",
+    "bar", "barh", "boxplot", "contour", "contourf", "errorbar", "fill",
+    "fill_between", "fill_betweenx", "grid", "hexbin", "hist", "hist2d",
+    "hlines", "imshow", "legend", "locator_params", "loglog", "margins",
+    "minorticks_off", "minorticks_on", "pcolormesh", "pie", "plot", "quiver",
+    "scatter", "semilogx", "semilogy", "stackplot", "stem", "step",
+    "streamplot", "text", "tick_params", "violinplot", "vlines",
+})
+
+# pyplot functions whose Axes method carries a ``set_`` prefix
+_AXES_SETTERS = frozenset({"title", "xlabel", "ylabel", "xscale", "yscale"})
+
+# pyplot functions that map onto a method of the current Figure
+_FIGURE_METHODS = frozenset({"savefig", "subplots_adjust", "suptitle", "tight_layout"})
+
+# Axes methods that pyplot follows with ``sci()``, and how pyplot picks the
+# mappable out of each return value
+_MAPPABLE_RESULTS = types.MappingProxyType({
+    "contour": lambda ret: ret,
+    "contourf": lambda ret: ret,
+    "hexbin": lambda ret: ret,
+    "hist2d": lambda ret: ret[-1],
+    "imshow": lambda ret: ret,
+    "pcolormesh": lambda ret: ret,
+    "quiver": lambda ret: ret,
+    "scatter": lambda ret: ret,
+    "streamplot": lambda ret: ret.lines,
+})
+
 
-    import builtins
-    for name in safe_builtins:
-        namespace["__builtins__"][name] = getattr(builtins, name)
+class _PltProxy:
+    """Stand-in for ``matplotlib.pyplot`` inside the plotting sandbox.
 
+    Common state-machine calls (``plt.plot``, ``plt.title``, ...) draw
+    straight onto a figure that pyplot never registers, avoiding its global
+    figure manager. Like pyplot, the figure is only created by the first
+    call that needs it, so rcParams and styles set earlier in the snippet
+    apply. The first call outside those lists (``plt.figure``,
+    ``plt.subplots``, ``plt.clim``, ...) switches the rest of the snippet
+    over to real pyplot, handing it the figure drawn so far.
+    """
+
+    def __init__(self):
+        self._fig = None
+        self._mappable = None
+        self._use_pyplot = False
+
+    def _figure(self):
+        if self._fig is None:
+            self._fig = _new_figure()
+        return self._fig
+
+    def _ax(self):
+        return self._figure().gca()
+
+    def gcf(self):
+        return self._figure() if not self._use_pyplot else plt.gcf()
+
+    def gca(self, *args, **kwargs):
+        return self._ax() if not self._use_pyplot else plt.gca(*args, **kwargs)
+
+    def gci(self):
+        return self._mappable if not self._use_pyplot else plt.gci()
+
+    def show(self, *args, **kwargs):
+        """Plots are saved by create_plot; showing is a no-op."""
+
+    def xlim(self, *args, **kwargs):
+        if self._use_pyplot:
+            return plt.xlim(*args, **kwargs)
+        if not args and not kwargs:
+            return self._ax().get_xlim()
+        return self._ax().set_xlim(*args, **kwargs)
+
+    def ylim(self, *args, **kwargs):
+        if self._use_pyplot:
+            return plt.ylim(*args, **kwargs)
+        if not args and not kwargs:
+            return self._ax().get_ylim()
+        return self._ax().set_ylim(*args, **kwargs)
+
+    def xticks(self, ticks=None, labels=None, **kwargs):
+        if self._use_pyplot:
+            return plt.xticks(ticks, labels, **kwargs)
+        return self._ticks(self._ax().xaxis, ticks, labels, **kwargs)
+
+    def yticks(self, ticks=None, labels=None, **kwargs):
+        if self._use_pyplot:
+            return plt.yticks(ticks, labels, **kwargs)
+        return self._ticks(self._ax().yaxis, ticks, labels, **kwargs)
+
+    @staticmethod
+    def _ticks(axis, ticks, labels, *, minor=False, **kwargs):
+        if ticks is None:
+            locs = axis.get_ticklocs(minor=minor)
+        else:
+            locs = axis.set_ticks(ticks, minor=minor)
+        if labels is None:
+            labels = axis.get_ticklabels(minor=minor)
+            for label in labels:
+                label.update(kwargs)
+        else:
+            labels = axis.set_ticklabels(labels, minor=minor, **kwargs)
+        return locs, labels
+
+    def colorbar(self, mappable=None, **kwargs):
+        if self._use_pyplot:
+            return plt.colorbar(mappable, **kwargs)
+        if mappable is None:
+            mappable = self._mappable
+            if mappable is None:
+                raise RuntimeError(
+                    "No mappable was found to use for colorbar creation. First "
+                    "define a mappable such as an image (with imshow) or a "
+                    "contour set (with contourf)."
+                )
+        ax = kwargs.pop("ax", None) or self._ax()
+        return self._figure().colorbar(mappable, ax=ax, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(plt, name)
+        # Classes, submodules and rcParams carry no figure state
+        if not isinstance(attr, types.FunctionType) or self._use_pyplot:
+            return attr
+        if name in _MAPPABLE_RESULTS:
+            return self._drawing_mappable(name)
+        if name in _AXES_METHODS:
+            return getattr(self._ax(), name)
+        if name in _AXES_SETTERS:
+            return getattr(self._ax(), f"set_{name}")
+        if name in _FIGURE_METHODS:
+            return getattr(self._figure(), name)
+        self._switch_to_pyplot()
+        return attr
+
+    def _drawing_mappable(self, name):
+        """Wrap an Axes method so its result becomes the current mappable."""
+        method = getattr(self._ax(), name)
+        pick = _MAPPABLE_RESULTS[name]
+
+        def draw(*args, **kwargs):
+            ret = method(*args, **kwargs)
+            self._mappable = pick(ret)
+            return ret
+
+        return draw
+
+    def _switch_to_pyplot(self):
+        """Run the rest of the snippet on pyplot, starting from our figure.
+
+        If anything was drawn, the figure is registered as pyplot's current
+        one, with the same current mappable, so calls like ``plt.clim`` or
+        ``plt.axes`` see the state they would have without the proxy.
+        """
+        self._use_pyplot = True
+        if self._fig is not None and self._fig.get_axes():
+            num = max(plt.get_fignums(), default=0) + 1
+            _pylab_helpers.Gcf._set_new_active_manager(
+                FigureCanvasAgg.new_manager(self._fig, num)
+            )
+            if self._mappable is not None and self._mappable.axes is plt.gca():
+                plt.sci(self._mappable)
+
+    def figure_to_save(self):
+        """Return the figure the snippet drew on, or None if there is none."""
+        if plt.get_fignums() and plt.gcf().get_axes():
+            return plt.gcf()
+        return self._fig
+
+
+def _new_figure():
+    """Create a figure outside pyplot's figure registry."""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _set_limit(kind: int, soft: int, hard: int) -> None:
+    """Lower a resource limit, never raising it above the current hard limit."""
+    _, current_hard = resource.getrlimit(kind)
+    if current_hard != resource.RLIM_INFINITY:
+        soft = min(soft, current_hard)
+        hard = min(hard, current_hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def _apply_resource_limits() -> None:
+    """Cap CPU time, memory and file size for the current process."""
+    _set_limit(resource.RLIMIT_CPU, PLOT_CPU_SECONDS, PLOT_CPU_SECONDS * 2)
+    _set_limit(resource.RLIMIT_FSIZE, PLOT_FILE_BYTES, PLOT_FILE_BYTES)
     try:
-        import matplotlib
-        import numpy as np
-        matplotlib.use('Agg')  # Non-interactive backend
-        import matplotlib.pyplot as plt
-
-        namespace["np"] = np
-        namespace["numpy"] = np
-        namespace["plt"] = plt
-        namespace["matplotlib"] = matplotlib
-
-        # Physics constants
-        namespace["G"] = 6.67430e-11
-        namespace["c"] = 299792458
-        namespace["M_sun"] = 1.989e30
-        namespace["M_earth"] = 5.972e24
-        namespace["R_earth"] = 6.371e6
-        namespace["AU"] = 1.496e11
-        namespace["pi"] = np.pi
-
-    except ImportError as e:
-        return f"Error: Required module not available: {e}"
+        with open("/proc/self/statm") as f:
+            address_space = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return
+    limit = address_space + PLOT_MEMORY_BYTES
+    _set_limit(resource.RLIMIT_AS, limit, limit)
+
+
+def _render(
+    compiled: types.CodeType,
+    dpi: int = 150,
+    compress_level: int = PNG_COMPRESS_LEVEL,
+) -> Tuple[str, object]:
+    """Execute plotting code and render the figure it drew on.
+
+    Returns:
+        ``("png", bytes)`` with the rendered image, or ``("message", str)``
+        with a warning or error for the caller
+    """
+    # Create isolated namespace from the prebuilt template
+    namespace = _SANDBOX_TEMPLATE.copy()
+    namespace["__builtins__"] = _SAFE_BUILTINS.copy()
+
+    # Draw on an unregistered figure unless the code creates its own
+    proxy = _PltProxy()
+    namespace["plt"] = proxy
 
     # Capture output
     stdout_capture = io.StringIO()
@@ -74,25 +334,138 @@ def create_plot(code: str, output_dir: str = "outputs") -> str:
 
     try:
         with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-            # Clear any existing figures
-            plt.close('all')
-
             # Execute the plotting code
-            compiled = compile(code, "<plot_code>", "exec")
             exec(compiled, namespace)
 
-            # Save the current figure
-            fig = plt.gcf()
-            if fig.get_axes():
-                fig.savefig(filepath, dpi=150, bbox_inches='tight',
-                           facecolor='white', edgecolor='none')
-                plt.close('all')
-                return f"Plot saved successfully: {filepath}"
-            else:
-                return "Warning: No plot was created. Make sure your code calls plt.plot() or similar."
+            # Render the figure the code drew on
+            fig = proxy.figure_to_save()
+            if fig is None or not fig.get_axes():
+                return "message", "Warning: No plot was created. Make sure your code calls plt.plot() or similar."
+
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=dpi, bbox_inches='tight',
+                        facecolor='white', edgecolor='none',
+                        pil_kwargs={"compress_level": compress_level, "optimize": False})
+            return "png", buffer.getvalue()
 
-    except SyntaxError as e:
-        return f"Syntax Error in plotting code: {e}"
     except Exception as e:
         tb = traceback.format_exc()
-        return f"Error creating plot: {e}\n\nTraceback:\n{tb}"
+        return "message", f"Error creating plot: {e}\n\nTraceback:\n{tb}"
+
+    finally:
+        if plt.get_fignums():
+            plt.close('all')
+
+
+# Multiprocessing context for isolated rendering, created on first use
+_context = None
+
+
+def _get_context():
+    """Return the forkserver context used for isolated rendering.
+
+    The fork server is a fresh, single-threaded interpreter with this
+    module preloaded, so plotting processes start warm without forking the
+    agent's own threads (warm-up, tool executors, HTTP pools).
+    """
+    global _context
+    if _context is None:
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        _context = ctx
+    return _context
+
+
+def _render_worker(conn, code: bytes, *args) -> None:
+    """Entry point of the isolated plotting process."""
+    _apply_resource_limits()
+    conn.send(_render(marshal.loads(code), *args))
+    conn.close()
+
+
+def _render_isolated(
+    timeout_seconds: int, compiled: types.CodeType, *args
+) -> Tuple[str, object]:
+    """Render in a separate, resource-limited process so runaway code cannot
+    hang or exhaust the agent. Falls back to in-process rendering where
+    ``forkserver`` or ``resource`` is unavailable.
+
+    Args:
+        timeout_seconds: Maximum wall-clock time for the child process
+        compiled: The compiled plotting code
+        *args: Remaining arguments forwarded to :func:`_render`
+    """
+    if not ISOLATION_AVAILABLE:
+        return _render(compiled, *args)
+
+    ctx = _get_context()
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_render_worker,
+        args=(send_conn, marshal.dumps(compiled), *args),
+        daemon=True,
+    )
+    process.start()
+    send_conn.close()
+
+    try:
+        if not recv_conn.poll(timeout_seconds):
+            return "message", f"Error: Plotting code exceeded the {timeout_seconds}s time limit."
+        return recv_conn.recv()
+    except EOFError:
+        process.join()
+        return "message", f"Error: Plotting process was terminated (exit code {process.exitcode})."
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        recv_conn.close()
+
+
+def create_plot(
+    code: str,
+    output_dir: str = "outputs",
+    timeout_seconds: int = 10,
+    dpi: int = 150,
+    compress_level: int = PNG_COMPRESS_LEVEL,
+) -> str:
+    """
+    Generate a visualization using Matplotlib.
+
+    The code should create a matplotlib figure. The function will automatically
+    save it and return the filename.
+
+    Args:
+        code: Python code that creates a matplotlib figure
+        output_dir: Directory to save plots (default: "outputs")
+        timeout_seconds: Maximum wall-clock time for the plotting code (default: 10 seconds)
+        dpi: Resolution of the saved image (default: 150)
+        compress_level: PNG zlib level from 0-9; lower saves faster but larger (default: 1)
+
+    Returns:
+        Path to the saved plot or error message
+    """
+    # Ensure output directory exists (a single stat in the common case)
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Generate unique filename
+    filename = f"plot_{uuid.uuid4().hex[:8]}.png"
+    filepath = os.path.join(output_dir, filename)
+
+    if not PLOTTING_AVAILABLE:
+        return f"Error: Required module not available: {_IMPORT_ERROR}"
+
+    try:
+        compiled = _compile_cached(code)
+    except SyntaxError as e:
+        return f"Syntax Error in plotting code: {e}"
+
+    kind, payload = _render_isolated(timeout_seconds, compiled, dpi, compress_level)
+
+    if kind != "png":
+        return payload
+
+    with open(filepath, "wb") as f:
+        f.write(payload)
+    return f"Plot saved successfully: {filepath}"
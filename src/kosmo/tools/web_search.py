@@ -1,6 +1,7 @@
 """Web search tool using Tavily API."""
 
 import os
+from functools import lru_cache
 
 try:
     from tavily import TavilyClient
@@ -8,8 +9,30 @@ try:
 except ImportError:
     TAVILY_AVAILABLE = False
 
+# Trusted scientific sources searched by the tool. The client accepts any
+# sequence and serializes it to JSON, so the tuple is passed as-is.
+SEARCH_DOMAINS = ("arxiv.org", "nasa.gov", "esa.int", "wikipedia.org", "space.com")
 
-def web_search(query: str, max_results: int = 5) -> str:
+# Longest snippet shown per result before it is cut off with "..."
+MAX_CONTENT_CHARS = 300
+
+
+def _snippet(content) -> str:
+    """Return result content, truncated with an ellipsis only when cut."""
+    if not content:
+        return "No content available"
+    if len(content) > MAX_CONTENT_CHARS:
+        return content[:MAX_CONTENT_CHARS] + "..."
+    return content
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> "TavilyClient":
+    """Return a TavilyClient for the key, reused so its HTTP session stays warm."""
+    return TavilyClient(api_key=api_key)
+
+
+def _web_search_impl(query: str, max_results: int = 5) -> str:
     """
     Search the web for scientific information using Tavily API.
 
@@ -25,34 +48,42 @@ def web_search(query: str, max_results: int = 5) -> str:
     if not api_key:
         return "Error: TAVILY_API_KEY not found in environment variables."
 
-    if not TAVILY_AVAILABLE:
-        return "Error: tavily-python package not installed. Run: pip install tavily-python"
-
     try:
-        client = TavilyClient(api_key=api_key)
+        client = _get_client(api_key)
         response = client.search(
             query=query,
             search_depth="advanced",
             max_results=max_results,
-            include_domains=["arxiv.org", "nasa.gov", "esa.int", "wikipedia.org", "space.com"],
+            include_domains=SEARCH_DOMAINS,
         )
 
         results = response.get("results", [])
         if not results:
             return f"No results found for query: {query}"
 
-        output = f"Search Results for: {query}\n" + "=" * 50 + "\n\n"
+        header = f"Search Results for: {query}\n" + "=" * 50 + "\n\n"
+        body = "".join([
+            f"{i}. {result.get('title', 'No title')}\n"
+            f"   URL: {result.get('url', 'No URL')}\n"
+            f"   {_snippet(result.get('content'))}\n\n"
+            for i, result in enumerate(results, 1)
+        ])
+        return header + body
+
+    except Exception as e:
+        return f"Error performing web search: {str(e)}"
 
-        for i, result in enumerate(results, 1):
-            title = result.get("title", "No title")
-            url = result.get("url", "No URL")
-            content = result.get("content", "No content available")
 
-            output += f"{i}. {title}\n"
-            output += f"   URL: {url}\n"
-            output += f"   {content[:300]}...\n\n"
+def _web_search_unavailable(query: str, max_results: int = 5) -> str:
+    """Stand-in for web_search when tavily-python is not installed."""
+    if not os.getenv("TAVILY_API_KEY"):
+        return "Error: TAVILY_API_KEY not found in environment variables."
+    return "Error: tavily-python package not installed. Run: pip install tavily-python"
 
-        return output
 
-    except Exception as e:
-        return f"Error performing web search: {str(e)}"
+# The package cannot appear after import, so pick the implementation once
+# here instead of re-checking TAVILY_AVAILABLE on every call.
+if TAVILY_AVAILABLE:
+    web_search = _web_search_impl
+else:
+    web_search = _web_search_unavailable
@@ -0,0 +1,5 @@
+"""Small helpers shared across Kosmo."""
+
+from .skid import SkidGenerator, new_thread_id
+
+__all__ = ["SkidGenerator", "new_thread_id"]
@@ -0,0 +1,58 @@
+"""Cheap, time-ordered unique IDs for session threads.
+
+``uuid.uuid4()`` reads 16 bytes from the OS random source for every call.
+Thread IDs only need to be unique, not unguessable, so they are built
+from the millisecond clock, the process ID and a per-process counter
+instead. The result is still a valid UUID (version 8, RFC 9562
+"custom" layout), so anything that parses thread IDs keeps working:
+
+    bits 127-80  milliseconds since the Unix epoch (48 bits)
+    bits 79-76   version (8)
+    bits 63-62   variant (0b10)
+    bits 61-40   process ID (22 bits)
+    bits 39-0    sequence counter (40 bits)
+"""
+
+import itertools
+import os
+import time
+import uuid
+
+_TIMESTAMP_MASK = (1 << 48) - 1
+_PID_MASK = (1 << 22) - 1
+_SEQ_MASK = (1 << 40) - 1
+_VERSION_AND_VARIANT = (0x8 << 76) | (0b10 << 62)
+
+
+class SkidGenerator:
+    """Generate unique, roughly time-sortable UUIDs without the OS RNG."""
+
+    __slots__ = ("_pid_bits", "_seq")
+
+    def __init__(self):
+        self._pid_bits = (os.getpid() & _PID_MASK) << 40
+        self._seq = itertools.count()
+
+    def reset_after_fork(self) -> None:
+        """Pick up the child's process ID so IDs stay unique across forks."""
+        self._pid_bits = (os.getpid() & _PID_MASK) << 40
+
+    def next(self) -> uuid.UUID:
+        """Return the next ID.
+
+        ``next()`` on an ``itertools.count`` is atomic under the GIL, so
+        concurrent callers never share a sequence number.
+        """
+        ts = (time.time_ns() // 1_000_000) & _TIMESTAMP_MASK
+        seq = next(self._seq) & _SEQ_MASK
+        return uuid.UUID(int=(ts << 80) | _VERSION_AND_VARIANT | self._pid_bits | seq)
+
+
+_generator = SkidGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_generator.reset_after_fork)
+
+
+def new_thread_id() -> str:
+    """Return a new unique thread ID string."""
+    return str(_generator.next())
@@ -0,0 +1,76 @@
+"""Background pre-import of heavy agent and tool dependencies.
+
+The agent imports LangChain/LangGraph, and the code executor SymPy,
+lazily on first use, which would put seconds of imports on the first
+query. The interactive CLI starts a warm-up thread while the user types
+so that cost is off the critical path.
+"""
+
+import importlib
+import threading
+from typing import Optional
+
+# Modules imported lazily by the agent and its tools. The agent's own
+# LangChain/LangGraph imports come first since every query needs them.
+# NumPy, Matplotlib and Requests are already loaded by ``kosmo.tools``.
+WARMUP_MODULES = (
+    "langchain_openai",
+    "langgraph.prebuilt",
+    "langgraph.checkpoint.memory",
+    "sympy",
+)
+
+_started = False
+_start_lock = threading.Lock()
+_done = threading.Event()
+
+
+def warmup() -> None:
+    """Import the heavy tool dependencies into ``sys.modules``.
+
+    Missing optional modules, and modules that fail to import for any
+    other reason, are skipped; the real import on first use reports the
+    error. Safe to call more than once; later calls only hit the import
+    cache.
+    """
+    try:
+        for name in WARMUP_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+    finally:
+        _done.set()
+
+
+def start_warmup() -> Optional[threading.Thread]:
+    """Run :func:`warmup` once per process on a daemon thread.
+
+    Returns:
+        The started thread, or None if warm-up was already started
+    """
+    global _started
+    with _start_lock:
+        if _started:
+            return None
+        _started = True
+
+    thread = threading.Thread(target=warmup, name="kosmo-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_warmup(timeout: Optional[float] = None) -> bool:
+    """Block until a started warm-up has finished.
+
+    Returns immediately if warm-up was never started.
+
+    Args:
+        timeout: Maximum seconds to wait (default: wait indefinitely)
+
+    Returns:
+        True if no warm-up is pending
+    """
+    if not _started:
+        return True
+    return _done.wait(timeout)
@@ -0,0 +1,30 @@
+"""Shared pytest fixtures."""
+
+from unittest.mock import Mock
+
+import pytest
+
+
+@pytest.fixture
+def mock_agent():
+    """A compiled-agent double whose invoke() returns one AI message."""
+    message = Mock(spec=["content", "type"])
+    message.content = "Test response"
+    message.type = "ai"
+    agent = Mock(spec=["invoke"])
+    agent.invoke.return_value = {"messages": [message]}
+    return agent
+
+
+@pytest.fixture
+def mock_react_agent(monkeypatch, mock_agent):
+    """Patch the LLM client and ReAct factory so queries run offline.
+
+    Returns the ``create_react_agent`` mock; every graph it builds is
+    ``mock_agent``.
+    """
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr("kosmo.agent.ChatOpenAI", Mock())
+    factory = Mock(return_value=mock_agent)
+    monkeypatch.setattr("kosmo.agent.create_react_agent", factory)
+    return factory
@@ -1,9 +1,14 @@
 """Tests for the ReAct agent."""
 
+import os
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from kosmo import agent as agent_module
 from kosmo.agent import (
     INCOMPLETE_INDICATORS,
     MAX_RETRIES,
@@ -13,6 +18,7 @@ from kosmo.agent import (
     _wrap_tool_with_retry,
     create_tools,
 )
+from kosmo.tools import web_search
 
 
 class TestCreateTools:
@@ -72,6 +78,30 @@ class TestKosmoAgentInit:
         assert agent._agents == {}
 
 
+class TestLazyLangchainImport:
+    """Tests for deferring the LangChain/LangGraph imports."""
+
+    def test_import_does_not_load_langchain(self):
+        """Test that importing the agent module skips the heavy imports."""
+        code = (
+            "import sys, kosmo.agent; "
+            "print('langchain_openai' in sys.modules, 'langgraph.prebuilt' in sys.modules)"
+        )
+        env = dict(os.environ, PYTHONPATH=str(Path(__file__).parent.parent / "src"))
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+        )
+        assert result.stdout.strip() == "False False"
+
+    def test_load_langchain_binds_globals(self):
+        """Test that _load_langchain fills in the deferred names."""
+        with patch.object(agent_module, "ChatOpenAI", None), \
+                patch.object(agent_module, "create_react_agent", None):
+            agent_module._load_langchain()
+            assert agent_module.ChatOpenAI is not None
+            assert agent_module.create_react_agent is not None
+
+
 class TestKosmoAgentMemory:
     """Tests for agent memory management."""
 
@@ -423,6 +453,20 @@ class TestCreateToolsWithRetry:
         tools = create_tools(with_retry=False)
         assert len(tools) == 4
 
+    def test_create_tools_is_memoized(self):
+        """Test that repeated calls share one immutable tool tuple."""
+        tools = create_tools()
+        assert isinstance(tools, tuple)
+        assert create_tools() is tools
+        assert create_tools(with_retry=True) is tools
+
+    def test_create_tools_cached_per_retry_setting(self):
+        """Test that retry and non-retry tools are cached separately."""
+        with_retry = create_tools(with_retry=True)
+        without_retry = create_tools(with_retry=False)
+        assert with_retry is not without_retry
+        assert without_retry[0].func is web_search
+
 
 class TestKosmoAgentCheckResponseComplete:
     """Tests for _check_response_complete method."""
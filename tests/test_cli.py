@@ -1,5 +1,6 @@
 """Tests for the CLI module."""
 
+import os
 import sys
 from unittest.mock import patch
 
@@ -97,6 +98,16 @@ class TestMainCLI:
             main()
         mock_query.assert_called_once_with('Test query', verbose=False)
 
+    @patch('kosmo.cli.run_single_query')
+    def test_no_cache_flag(self, mock_query):
+        """Test --no-cache disables the persistent Wikipedia cache."""
+        mock_query.return_value = "Test response"
+        with patch.dict(os.environ):
+            with patch.object(sys, 'argv', ['kosmo', '--no-cache', 'Test query']):
+                main()
+            assert os.environ.get("KOSMO_NO_CACHE") == "1"
+        mock_query.assert_called_once_with('Test query', verbose=True)
+
     @patch('kosmo.cli.run_interactive')
     def test_interactive_mode_no_args(self, mock_interactive):
         """Test that no arguments starts interactive mode."""
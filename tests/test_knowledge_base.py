@@ -1,9 +1,40 @@
 """Tests for the knowledge base (Wikipedia) tool."""
 
+import json
+import os
+import shutil
+import tempfile
+import time
 import unittest
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from kosmo.tools.knowledge_base import _search_and_get_summary, search_wikipedia
+from kosmo.tools.knowledge_base import (
+    DiskCache,
+    _get_cache,
+    _search_and_get_summary,
+    _take_sentences,
+    search_wikipedia,
+    search_wikipedia_many,
+)
+
+# Keep lookups in this module independent of each other and of ~/.cache
+_no_cache = patch.dict(os.environ, {"KOSMO_NO_CACHE": "1"})
+
+
+def setUpModule():
+    _no_cache.start()
+
+
+def tearDownModule():
+    _no_cache.stop()
+
+
+def _fake_response(status=200, payload=None, content=None):
+    """Build a minimal stand-in for ``requests.Response``."""
+    if content is None:
+        content = json.dumps(payload).encode()
+    return SimpleNamespace(status_code=status, content=content, headers={})
 
 
 class TestSearchWikipediaBasic(unittest.TestCase):
@@ -12,9 +43,7 @@ class TestSearchWikipediaBasic(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_successful_search(self, mock_get):
         """Test successful Wikipedia search."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Dark matter",
             "extract": "Dark matter is a hypothetical form of matter. "
                       "It does not emit light. It is invisible. "
@@ -24,7 +53,7 @@ class TestSearchWikipediaBasic(unittest.TestCase):
                     "page": "https://en.wikipedia.org/wiki/Dark_matter"
                 }
             }
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("dark matter")
@@ -36,13 +65,11 @@ class TestSearchWikipediaBasic(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_returns_title(self, mock_get):
         """Test that result includes the title."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Black hole",
             "extract": "A black hole is a region of spacetime.",
             "content_urls": {"desktop": {"page": "https://example.com"}}
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("black hole")
@@ -52,9 +79,7 @@ class TestSearchWikipediaBasic(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_returns_url(self, mock_get):
         """Test that result includes source URL."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Exoplanet",
             "extract": "An exoplanet is a planet outside the Solar System.",
             "content_urls": {
@@ -62,7 +87,7 @@ class TestSearchWikipediaBasic(unittest.TestCase):
                     "page": "https://en.wikipedia.org/wiki/Exoplanet"
                 }
             }
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("exoplanet")
@@ -77,13 +102,11 @@ class TestSearchWikipediaSentences(unittest.TestCase):
     def test_default_sentences(self, mock_get):
         """Test default 5 sentences limit."""
         long_extract = ". ".join([f"Sentence {i}" for i in range(10)]) + "."
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Test",
             "extract": long_extract,
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test")
@@ -97,13 +120,11 @@ class TestSearchWikipediaSentences(unittest.TestCase):
     def test_custom_sentences_limit(self, mock_get):
         """Test custom sentence limit."""
         long_extract = ". ".join([f"Sentence {i}" for i in range(10)]) + "."
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Test",
             "extract": long_extract,
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test", sentences=3)
@@ -115,13 +136,11 @@ class TestSearchWikipediaSentences(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_fewer_sentences_than_limit(self, mock_get):
         """Test when extract has fewer sentences than limit."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Test",
             "extract": "First sentence. Second sentence.",
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test", sentences=10)
@@ -129,6 +148,41 @@ class TestSearchWikipediaSentences(unittest.TestCase):
         assert "First sentence" in result
         assert "Second sentence" in result
 
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_abbreviation_not_split(self, mock_get):
+        """Test that abbreviations are not treated as sentence ends."""
+        mock_response = _fake_response(200, {
+            "title": "Test",
+            "extract": "Dr. Smith went home. He observed Mars. It was red.",
+            "content_urls": {"desktop": {"page": ""}}
+        })
+        mock_get.return_value = mock_response
+
+        result = search_wikipedia("test", sentences=2)
+
+        assert "Dr. Smith went home. He observed Mars." in result
+        assert "It was red" not in result
+
+    def test_zero_sentences(self):
+        """Test that asking for no sentences returns an empty extract."""
+        assert _take_sentences("First sentence. Second sentence.", 0) == ""
+        assert _take_sentences("First sentence. Second sentence.", -1) == ""
+
+    def test_large_extract_split(self):
+        """Test truncating a 100 KB extract only scans up to the cut-off."""
+        sentence = "Sentence {} describes the galactic core in some detail. "
+        text = "".join(sentence.format(i) for i in range(2000))
+        assert len(text) > 100_000
+
+        start = time.perf_counter()
+        for _ in range(100):
+            result = _take_sentences(text, 5)
+        elapsed = time.perf_counter() - start
+
+        assert result.endswith("Sentence 4 describes the galactic core in some detail.")
+        assert "Sentence 5" not in result
+        assert elapsed < 0.5
+
 
 class TestSearchWikipediaDisambiguation(unittest.TestCase):
     """Tests for disambiguation page handling."""
@@ -136,13 +190,11 @@ class TestSearchWikipediaDisambiguation(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_disambiguation_page(self, mock_get):
         """Test handling of disambiguation page."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "type": "disambiguation",
             "title": "Mercury",
             "extract": "Mercury may refer to: Mercury (planet), Mercury (element)"
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("mercury")
@@ -158,49 +210,37 @@ class TestSearchWikipedia404Fallback(unittest.TestCase):
     def test_404_triggers_search_fallback(self, mock_get):
         """Test that 404 triggers search API fallback."""
         # First call returns 404
-        mock_404_response = MagicMock()
-        mock_404_response.status_code = 404
+        mock_404_response = _fake_response(404)
 
-        # Search API call
-        mock_search_response = MagicMock()
-        mock_search_response.status_code = 200
-        mock_search_response.json.return_value = {
+        # Combined generator=search call returns the hit and its extract
+        mock_search_response = _fake_response(200, {
             "query": {
-                "search": [
-                    {"title": "Cosmic microwave background"}
+                "pages": [
+                    {
+                        "title": "Cosmic microwave background",
+                        "index": 1,
+                        "extract": "The CMB is electromagnetic radiation.",
+                        "fullurl": "https://en.wikipedia.org/wiki/Cosmic_microwave_background"
+                    }
                 ]
             }
-        }
-
-        # Summary call for search result
-        mock_summary_response = MagicMock()
-        mock_summary_response.status_code = 200
-        mock_summary_response.json.return_value = {
-            "title": "Cosmic microwave background",
-            "extract": "The CMB is electromagnetic radiation.",
-            "content_urls": {"desktop": {"page": "https://example.com"}}
-        }
+        })
 
-        mock_get.side_effect = [mock_404_response, mock_search_response, mock_summary_response]
+        mock_get.side_effect = [mock_404_response, mock_search_response]
 
-        search_wikipedia("cmb radiation")
+        result = search_wikipedia("cmb radiation")
 
-        # Should have made multiple calls
-        assert mock_get.call_count == 3
+        # Initial 404 plus a single combined search request
+        assert mock_get.call_count == 2
+        assert "**Cosmic microwave background**" in result
+        assert "electromagnetic radiation" in result
 
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_no_search_results(self, mock_get):
         """Test handling when search returns no results."""
-        mock_404_response = MagicMock()
-        mock_404_response.status_code = 404
+        mock_404_response = _fake_response(404)
 
-        mock_search_response = MagicMock()
-        mock_search_response.status_code = 200
-        mock_search_response.json.return_value = {
-            "query": {
-                "search": []
-            }
-        }
+        mock_search_response = _fake_response(200, {"batchcomplete": True})
 
         mock_get.side_effect = [mock_404_response, mock_search_response]
 
@@ -245,8 +285,7 @@ class TestSearchWikipediaErrorHandling(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_non_200_status(self, mock_get):
         """Test handling of non-200 status code."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
+        mock_response = _fake_response(500)
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test")
@@ -257,15 +296,23 @@ class TestSearchWikipediaErrorHandling(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_json_decode_error(self, mock_get):
         """Test handling of JSON decode error."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = ValueError("Invalid JSON")
+        mock_response = _fake_response(200, content=b"<html>Invalid JSON")
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test")
 
         assert "Error processing Wikipedia" in result
 
+    @patch("kosmo.tools.knowledge_base._json_loads", json.loads)
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_json_decode_error_stdlib_fallback(self, mock_get):
+        """Test decode errors without orjson installed."""
+        mock_get.return_value = _fake_response(200, content=b"<html>Invalid JSON")
+
+        result = search_wikipedia("test")
+
+        assert "Error processing Wikipedia" in result
+
 
 class TestSearchWikipediaUrlEncoding(unittest.TestCase):
     """Tests for URL encoding in search_wikipedia."""
@@ -273,13 +320,11 @@ class TestSearchWikipediaUrlEncoding(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_spaces_converted_to_underscores(self, mock_get):
         """Test that spaces are converted to underscores."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Dark matter",
             "extract": "Test extract.",
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         search_wikipedia("dark matter")
@@ -291,13 +336,11 @@ class TestSearchWikipediaUrlEncoding(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_user_agent_header(self, mock_get):
         """Test that User-Agent header is set."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Test",
             "extract": "Test.",
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         search_wikipedia("test")
@@ -314,12 +357,10 @@ class TestSearchWikipediaMissingData(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_missing_extract(self, mock_get):
         """Test handling of missing extract."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Test",
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test")
@@ -329,12 +370,10 @@ class TestSearchWikipediaMissingData(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_missing_url(self, mock_get):
         """Test handling of missing URL."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "title": "Test",
             "extract": "Test extract."
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test")
@@ -346,12 +385,10 @@ class TestSearchWikipediaMissingData(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_missing_title(self, mock_get):
         """Test handling of missing title."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _fake_response(200, {
             "extract": "Test extract.",
             "content_urls": {"desktop": {"page": ""}}
-        }
+        })
         mock_get.return_value = mock_response
 
         result = search_wikipedia("test_query")
@@ -366,41 +403,57 @@ class TestSearchAndGetSummary(unittest.TestCase):
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_search_returns_results(self, mock_get):
         """Test search with valid results."""
-        mock_search_response = MagicMock()
-        mock_search_response.status_code = 200
-        mock_search_response.json.return_value = {
+        mock_search_response = _fake_response(200, {
             "query": {
-                "search": [
-                    {"title": "Result One"},
-                    {"title": "Result Two"},
-                    {"title": "Result Three"}
+                "pages": [
+                    {"title": "Result Two", "index": 2, "extract": "Second."},
+                    {"title": "Result One", "index": 1, "extract": "This is the first result."}
                 ]
             }
-        }
+        })
+        mock_get.return_value = mock_search_response
 
-        mock_summary_response = MagicMock()
-        mock_summary_response.status_code = 200
-        mock_summary_response.json.return_value = {
-            "title": "Result One",
-            "extract": "This is the first result.",
-            "content_urls": {"desktop": {"page": ""}}
-        }
+        result, ok = _search_and_get_summary("test", 5)
+
+        assert ok
+        assert "**Result One**" in result
+        assert "This is the first result." in result
 
-        mock_get.side_effect = [mock_search_response, mock_summary_response]
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_generator_search_single_call(self, mock_get):
+        """Test that search and extract are fetched in one request."""
+        mock_search_response = _fake_response(200, {
+            "query": {
+                "pages": [
+                    {
+                        "title": "Dark energy",
+                        "index": 1,
+                        "extract": "Dark energy is a form of energy.",
+                        "fullurl": "https://en.wikipedia.org/wiki/Dark_energy"
+                    }
+                ]
+            }
+        })
+        mock_get.return_value = mock_search_response
 
-        result = _search_and_get_summary("test", 5)
+        result, ok = _search_and_get_summary("dark enrgy", 3)
 
-        assert "Result One" in result
+        assert mock_get.call_count == 1
+        params = mock_get.call_args[1]["params"]
+        assert params["generator"] == "search"
+        assert params["gsrsearch"] == "dark enrgy"
+        assert params["exsentences"] == 3
+        assert "Source: https://en.wikipedia.org/wiki/Dark_energy" in result
 
     @patch("kosmo.tools.knowledge_base.requests.get")
     def test_search_api_error(self, mock_get):
         """Test handling of search API error."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
+        mock_response = _fake_response(500)
         mock_get.return_value = mock_response
 
-        result = _search_and_get_summary("test", 5)
+        result, ok = _search_and_get_summary("test", 5)
 
+        assert not ok
         assert "Error" in result
         assert "500" in result
 
@@ -409,11 +462,206 @@ class TestSearchAndGetSummary(unittest.TestCase):
         """Test handling of exception during search."""
         mock_get.side_effect = Exception("Network error")
 
-        result = _search_and_get_summary("test", 5)
+        result, ok = _search_and_get_summary("test", 5)
 
+        assert not ok
         assert "Error searching Wikipedia" in result
 
 
+class TestSearchWikipediaMany(unittest.TestCase):
+    """Tests for concurrent batched lookups."""
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_results_in_query_order(self, mock_get):
+        """Test that results are returned in the order of the queries."""
+        def fake_get(url, **kwargs):
+            title = url.rsplit("/", 1)[-1].replace("_", " ")
+            response = _fake_response(200, {"title": title, "extract": f"About {title}."})
+            return response
+
+        mock_get.side_effect = fake_get
+
+        results = search_wikipedia_many(["Pulsar", "Quasar", "Black hole"])
+
+        assert len(results) == 3
+        assert "**Pulsar**" in results[0]
+        assert "**Quasar**" in results[1]
+        assert "**Black hole**" in results[2]
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_requests_run_concurrently(self, mock_get):
+        """Test that batched lookups overlap instead of running serially."""
+        def slow_get(url, **kwargs):
+            time.sleep(0.2)
+            response = _fake_response(200, {"title": "Test", "extract": "Test."})
+            return response
+
+        mock_get.side_effect = slow_get
+
+        start = time.perf_counter()
+        results = search_wikipedia_many(["a", "b", "c", "d", "e"])
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 5
+        assert elapsed < 0.2 * 5 / 2
+
+    def test_empty_queries(self):
+        """Test that an empty batch returns an empty list."""
+        assert search_wikipedia_many([]) == []
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_coalesces_concurrent_calls(self, mock_get):
+        """Test that identical concurrent lookups share one request."""
+        def slow_get(url, **kwargs):
+            time.sleep(0.2)
+            return _fake_response(200, {"title": "Same", "extract": "Same."})
+
+        mock_get.side_effect = slow_get
+
+        results = search_wikipedia_many(["same"] * 5)
+
+        assert mock_get.call_count == 1
+        assert all(r == results[0] for r in results)
+        assert "**Same**" in results[0]
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_sequential_calls_not_coalesced(self, mock_get):
+        """Test that a finished lookup is not reused by later calls."""
+        mock_get.return_value = _fake_response(200, {"title": "Same", "extract": "Same."})
+
+        search_wikipedia("same")
+        search_wikipedia("same")
+
+        assert mock_get.call_count == 2
+
+
+class TestSearchWikipediaCache(unittest.TestCase):
+    """Tests for the persistent Wikipedia result cache."""
+
+    def setUp(self):
+        """Point the cache at a temporary directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = DiskCache(self.cache_dir)
+        env = patch.dict(os.environ, {"KOSMO_NO_CACHE": ""})
+        env.start()
+        self.addCleanup(env.stop)
+        cache = patch("kosmo.tools.knowledge_base._cache", self.cache)
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_repeat_lookup_served_from_cache(self, mock_get):
+        """Test that a repeated query does not hit the network."""
+        mock_get.return_value = _fake_response(200, {"title": "Pulsar", "extract": "A star."})
+
+        first = search_wikipedia("pulsar")
+        second = search_wikipedia("pulsar")
+
+        assert first == second
+        assert mock_get.call_count == 1
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_errors_not_cached(self, mock_get):
+        """Test that failed lookups are retried instead of cached."""
+        mock_get.return_value = _fake_response(500)
+
+        search_wikipedia("pulsar")
+        search_wikipedia("pulsar")
+
+        assert mock_get.call_count == 2
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_use_cache_false_bypasses_cache(self, mock_get):
+        """Test that use_cache=False always fetches."""
+        mock_get.return_value = _fake_response(200, {"title": "Pulsar", "extract": "A star."})
+
+        search_wikipedia("pulsar", use_cache=False)
+        search_wikipedia("pulsar", use_cache=False)
+
+        assert mock_get.call_count == 2
+        assert self.cache.get("5:pulsar") is None
+
+    def test_disk_cache_survives_new_instance(self):
+        """Test that entries persist across cache instances on the same directory."""
+        self.cache.set("key", "value")
+
+        reopened = DiskCache(self.cache_dir)
+
+        assert reopened.get("key") == "value"
+
+    def test_expired_entries_ignored(self):
+        """Test that expired entries are treated as misses."""
+        self.cache.set("key", "value", expire=-1)
+
+        assert self.cache.get("key") is None
+
+    def test_max_entries_enforced(self):
+        """Test that the cache evicts entries beyond its capacity."""
+        cache = DiskCache(self.cache_dir, max_entries=3)
+        for i in range(5):
+            cache.set(f"key{i}", "value", expire=100 + i)
+
+        assert cache.get("key0") is None
+        assert cache.get("key4") == "value"
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_not_found_not_cached(self, mock_get):
+        """Test that "no articles found" results are not cached."""
+        mock_get.side_effect = [
+            _fake_response(404),
+            _fake_response(200, {"query": {"pages": []}}),
+        ] * 2
+
+        first = search_wikipedia("qwertyuiop")
+        search_wikipedia("qwertyuiop")
+
+        assert "No Wikipedia articles found" in first
+        assert mock_get.call_count == 4
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_disambiguation_not_cached(self, mock_get):
+        """Test that disambiguation notices are not cached."""
+        mock_get.return_value = _fake_response(
+            200, {"type": "disambiguation", "extract": "Mercury may refer to..."}
+        )
+
+        first = search_wikipedia("Mercury")
+        search_wikipedia("Mercury")
+
+        assert "ambiguous" in first
+        assert mock_get.call_count == 2
+
+    @patch("kosmo.tools.knowledge_base.requests.get")
+    def test_coalesced_lookup_cached_once(self, mock_get):
+        """Test that only the request owner writes the cache, not its joiners."""
+        def slow_get(url, **kwargs):
+            time.sleep(0.2)
+            return _fake_response(200, {"title": "Same", "extract": "Same."})
+
+        mock_get.side_effect = slow_get
+
+        with patch.object(self.cache, "set", wraps=self.cache.set) as mock_set:
+            results = search_wikipedia_many(["same"] * 5)
+
+        assert mock_get.call_count == 1
+        mock_set.assert_called_once_with("5:same", results[0])
+        assert self.cache.get("5:same") == results[0]
+
+    def test_cache_setup_failure_remembered(self):
+        """Test that a cache directory that cannot be created is not retried."""
+        with patch("kosmo.tools.knowledge_base._cache", None), \
+                patch("kosmo.tools.knowledge_base._cache_failed", False), \
+                patch("kosmo.tools.knowledge_base.DiskCache", side_effect=OSError) as mock_cache:
+            assert _get_cache() is None
+            assert _get_cache() is None
+
+        mock_cache.assert_called_once()
+
+
 class TestSearchWikipediaAgentIntegration(unittest.TestCase):
     """Tests for integration with the agent tool system."""
 
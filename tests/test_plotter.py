@@ -1,23 +1,56 @@
 """Tests for the plotting tool."""
 
+import builtins
 import os
 import shutil
 import tempfile
+import threading
+import time
 import unittest
+import warnings
+from unittest.mock import patch
 
-from kosmo.tools.plotter import create_plot
+import matplotlib
+import matplotlib.pyplot as pyplot
+import pytest
+from matplotlib.figure import Figure
+from PIL import Image
 
+from kosmo.tools.plotter import (
+    _CODE_CACHE,
+    CODE_CACHE_SIZE,
+    ISOLATION_AVAILABLE,
+    _get_context,
+    create_plot,
+)
 
-class TestCreatePlotBasic(unittest.TestCase):
-    """Basic tests for create_plot function."""
+
+class PlotOutputTestCase(unittest.TestCase):
+    """Base class giving each test its own empty output directory.
+
+    One temporary root is created per class and removed once; tests get a
+    cheap subdirectory of it instead of a fresh mkdtemp/rmtree pair.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared temporary root for this class."""
+        cls.root_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary root."""
+        shutil.rmtree(cls.root_dir, ignore_errors=True)
 
     def setUp(self):
-        """Create a temporary directory for test outputs."""
-        self.test_dir = tempfile.mkdtemp()
+        """Create an empty output directory for this test."""
+        self.test_dir = os.path.join(self.root_dir, self._testMethodName)
+        os.mkdir(self.test_dir)
+
 
-    def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+@pytest.mark.parallel_safe
+class TestCreatePlotBasic(PlotOutputTestCase):
+    """Basic tests for create_plot function."""
 
     def test_simple_line_plot(self):
         """Test creating a simple line plot."""
@@ -91,17 +124,59 @@ plt.grid(True)
         result = create_plot(code, output_dir=self.test_dir)
         assert "Plot saved successfully" in result
 
+    def test_second_plot_is_fast(self):
+        """Test that repeat plots do not pay matplotlib start-up costs."""
+        code = """
+plt.plot([1, 2, 3], [1, 4, 9])
+plt.title('Warm')
+"""
+        create_plot(code, output_dir=self.test_dir)
 
-class TestCreatePlotErrors(unittest.TestCase):
-    """Tests for error handling in create_plot."""
+        start = time.perf_counter()
+        result = create_plot(code, output_dir=self.test_dir)
+        elapsed = time.perf_counter() - start
 
-    def setUp(self):
-        """Create a temporary directory for test outputs."""
-        self.test_dir = tempfile.mkdtemp()
+        assert "Plot saved successfully" in result
+        # Generous bound so the check holds with several xdist workers per core
+        assert elapsed < 2.0
+
+    def test_saved_png_is_valid(self):
+        """Test that the saved file is a readable PNG image."""
+        code = """
+plt.plot([1, 2, 3], [1, 4, 9])
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        path = result.split(": ", 1)[1]
+        with Image.open(path) as image:
+            assert image.format == "PNG"
+
+    def test_dpi_controls_resolution(self):
+        """Test that a higher dpi produces a larger image."""
+        code = """
+plt.plot([1, 2, 3], [1, 4, 9])
+"""
+        low = create_plot(code, output_dir=self.test_dir, dpi=50).split(": ", 1)[1]
+        high = create_plot(code, output_dir=self.test_dir, dpi=100).split(": ", 1)[1]
+        with Image.open(low) as low_image, Image.open(high) as high_image:
+            assert high_image.width > low_image.width
+
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_savefig_options_used(self):
+        """Test that dpi and PNG compression options reach savefig."""
+        code = """
+plt.plot([1, 2, 3])
+"""
+        with patch.object(Figure, "savefig") as mock_savefig:
+            create_plot(code, output_dir=self.test_dir, dpi=80, compress_level=3)
+
+        kwargs = mock_savefig.call_args[1]
+        assert kwargs["dpi"] == 80
+        assert kwargs["pil_kwargs"]["compress_level"] == 3
 
-    def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+@pytest.mark.parallel_safe
+class TestCreatePlotErrors(PlotOutputTestCase):
+    """Tests for error handling in create_plot."""
 
     def test_syntax_error(self):
         """Test that syntax errors are properly reported."""
@@ -143,21 +218,53 @@ plt.plot([y])
         assert "Error creating plot" in result
         assert "division by zero" in result.lower()
 
+    def test_syntax_error_not_cached(self):
+        """Test that code failing to compile stays out of the cache."""
+        code = "plt.plot([1, 2\n"
+        create_plot(code, output_dir=self.test_dir)
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Syntax Error" in result
+
 
-class TestCreatePlotOutputDir(unittest.TestCase):
-    """Tests for output directory handling."""
+@pytest.mark.parallel_safe
+class TestCreatePlotCompileCache(PlotOutputTestCase):
+    """Tests for the compiled code cache."""
 
     def setUp(self):
-        """Create a temporary base directory."""
-        self.base_dir = tempfile.mkdtemp()
+        """Create an output directory and start from an empty cache."""
+        super().setUp()
+        _CODE_CACHE.clear()
+
+    def test_compile_cache_hit(self):
+        """Test that repeated code is compiled only once."""
+        code = """
+plt.plot([1, 2, 3], [3, 2, 1])
+"""
+        with patch("builtins.compile", wraps=builtins.compile) as mock_compile:
+            create_plot(code, output_dir=self.test_dir)
+            create_plot(code, output_dir=self.test_dir)
+
+        plot_compiles = [
+            c for c in mock_compile.call_args_list if c.args[1:2] == ("<plot_code>",)
+        ]
+        assert len(plot_compiles) == 1
+        assert len(_CODE_CACHE) == 1
+
+    def test_cache_is_bounded(self):
+        """Test that the cache evicts old entries beyond its size limit."""
+        for i in range(CODE_CACHE_SIZE + 5):
+            create_plot(f"x = {i}", output_dir=self.test_dir)
 
-    def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.base_dir, ignore_errors=True)
+        assert len(_CODE_CACHE) == CODE_CACHE_SIZE
+
+
+@pytest.mark.parallel_safe
+class TestCreatePlotOutputDir(PlotOutputTestCase):
+    """Tests for output directory handling."""
 
     def test_creates_output_directory(self):
         """Test that output directory is created if it doesn't exist."""
-        new_dir = os.path.join(self.base_dir, "new_output_dir")
+        new_dir = os.path.join(self.test_dir, "new_output_dir")
         assert not os.path.exists(new_dir)
 
         code = """
@@ -169,7 +276,7 @@ plt.plot([1, 2, 3], [1, 4, 9])
 
     def test_nested_output_directory(self):
         """Test creating nested output directories."""
-        nested_dir = os.path.join(self.base_dir, "level1", "level2", "plots")
+        nested_dir = os.path.join(self.test_dir, "level1", "level2", "plots")
 
         code = """
 plt.plot([1, 2, 3], [1, 4, 9])
@@ -179,17 +286,10 @@ plt.plot([1, 2, 3], [1, 4, 9])
         assert os.path.exists(nested_dir)
 
 
-class TestCreatePlotSandbox(unittest.TestCase):
+@pytest.mark.parallel_safe
+class TestCreatePlotSandbox(PlotOutputTestCase):
     """Tests for sandbox security in create_plot."""
 
-    def setUp(self):
-        """Create a temporary directory for test outputs."""
-        self.test_dir = tempfile.mkdtemp()
-
-    def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-
     def test_import_blocked(self):
         """Test that arbitrary imports are blocked."""
         code = """
@@ -239,17 +339,93 @@ plt.title(f'Sum: {data_sum}, Max: {data_max}, Min: {data_min}')
         result = create_plot(code, output_dir=self.test_dir)
         assert "Plot saved successfully" in result
 
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_template_not_mutated(self):
+        """Test that reassigning constants does not leak into later calls."""
+        create_plot("G = 0\nplt.plot([1, 2])", output_dir=self.test_dir)
 
-class TestCreatePlotVisualizationTypes(unittest.TestCase):
-    """Tests for various visualization types."""
+        code = """
+assert G == 6.67430e-11
+plt.plot([1, 2])
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+
+
+@pytest.mark.parallel_safe
+@unittest.skipUnless(ISOLATION_AVAILABLE, "process isolation requires forkserver and resource")
+class TestCreatePlotResourceLimits(PlotOutputTestCase):
+    """Tests for the isolated, resource-limited plotting process."""
+
+    def test_infinite_loop_terminated(self):
+        """Test that a runaway loop is stopped instead of hanging the agent."""
+        code = """
+while True:
+    pass
+"""
+        start = time.perf_counter()
+        result = create_plot(code, output_dir=self.test_dir, timeout_seconds=2)
+        elapsed = time.perf_counter() - start
+
+        assert "Error" in result
+        assert "time limit" in result
+        assert elapsed < 6
+
+    def test_memory_limit_enforced(self):
+        """Test that oversized allocations fail inside the plotting process."""
+        code = """
+data = np.ones(2 * 10**8)  # 1.6 GB, above the memory headroom
+plt.plot(data[:10])
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Error" in result
+        assert os.listdir(self.test_dir) == []
+
+    def test_plot_written_by_parent(self):
+        """Test that the rendered image reaches the output directory."""
+        code = """
+plt.plot([1, 2, 3], [1, 4, 9])
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+
+        path = result.split(": ", 1)[1]
+        with open(path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    def test_render_while_thread_holds_lock(self):
+        """Test that a busy parent thread cannot leak into the plotting process."""
+        code = """
+plt.plot([1, 2, 3])
+"""
+        lock = threading.Lock()
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with lock:
+                held.set()
+                release.wait(30)
+
+        thread = threading.Thread(target=hold_lock, daemon=True)
+        thread.start()
+        held.wait(5)
+        try:
+            with warnings.catch_warnings():
+                # Python 3.12+ warns when fork() runs with other threads alive
+                warnings.simplefilter("error", DeprecationWarning)
+                result = create_plot(code, output_dir=self.test_dir, timeout_seconds=20)
+        finally:
+            release.set()
+            thread.join()
+
+        assert "Plot saved successfully" in result
+        assert _get_context().get_start_method() == "forkserver"
 
-    def setUp(self):
-        """Create a temporary directory for test outputs."""
-        self.test_dir = tempfile.mkdtemp()
 
-    def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+@pytest.mark.parallel_safe
+class TestCreatePlotVisualizationTypes(PlotOutputTestCase):
+    """Tests for various visualization types."""
 
     def test_bar_chart(self):
         """Test creating a bar chart."""
@@ -305,17 +481,126 @@ ax.set_title('Polar Plot')
         result = create_plot(code, output_dir=self.test_dir)
         assert "Plot saved successfully" in result
 
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_no_pyplot_registration(self):
+        """Test that simple plots bypass pyplot's global figure registry."""
+        code = """
+x = np.linspace(0, 10, 100)
+plt.plot(x, np.sin(x))
+plt.title('Sine Wave')
+plt.xlabel('x')
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+        assert len(pyplot.get_fignums()) == 0
 
-class TestCreatePlotCosmologyExamples(unittest.TestCase):
-    """Tests for cosmology-specific plotting examples."""
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_axis_helpers_without_pyplot(self):
+        """Test limit, tick and colorbar helpers on the direct figure path."""
+        code = """
+data = np.arange(16).reshape(4, 4)
+plt.imshow(data)
+plt.colorbar()
+plt.xlim(0, 3)
+assert plt.xlim() == (0.0, 3.0)
+plt.xticks([0, 1, 2, 3], ['a', 'b', 'c', 'd'], rotation=45)
+plt.yscale('linear')
+plt.tight_layout()
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+        assert len(pyplot.get_fignums()) == 0
 
-    def setUp(self):
-        """Create a temporary directory for test outputs."""
-        self.test_dir = tempfile.mkdtemp()
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_explicit_figure_uses_pyplot(self):
+        """Test that plt.figure switches the snippet to real pyplot."""
+        code = """
+plt.figure(figsize=(4, 3))
+plt.plot([1, 2, 3])
+assert plt.gcf().get_size_inches()[0] == 4
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+        assert len(pyplot.get_fignums()) == 0
+
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_figure_after_drawing(self):
+        """Test that plt.figure after drawing starts a new pyplot figure."""
+        code = """
+plt.plot([1, 2])
+plt.figure(figsize=(4, 3))
+plt.plot([3, 4])
+assert plt.gcf().get_size_inches()[0] == 4
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+        assert len(pyplot.get_fignums()) == 0
+
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_axes_after_drawing(self):
+        """Test that plt.axes after drawing adds an inset to the drawn figure."""
+        code = """
+plt.plot([1, 2, 3])
+inset = plt.axes([0.6, 0.6, 0.25, 0.25])
+inset.plot([3, 2, 1])
+assert len(plt.gcf().get_axes()) == 2
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+        assert len(pyplot.get_fignums()) == 0
 
-    def tearDown(self):
-        """Remove the temporary directory after tests."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_clim_after_imshow(self):
+        """Test that pyplot-only image helpers see the image drawn so far."""
+        code = """
+plt.imshow(np.arange(16).reshape(4, 4))
+plt.clim(0, 1)
+assert plt.gci().get_clim() == (0, 1)
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+        assert len(pyplot.get_fignums()) == 0
+
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_colorbar_uses_latest_mappable(self):
+        """Test that colorbar follows the latest mappable, as pyplot's gci does."""
+        code = """
+plt.imshow(np.arange(16).reshape(4, 4))
+points = plt.scatter([1, 2], [1, 2], c=[0.0, 1.0])
+assert plt.gci() is points
+assert plt.colorbar().mappable is points
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "Plot saved successfully" in result
+
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_colorbar_without_mappable_fails(self):
+        """Test that colorbar without a mappable errors like pyplot."""
+        code = """
+plt.plot([1, 2, 3])
+plt.colorbar()
+"""
+        result = create_plot(code, output_dir=self.test_dir)
+        assert "No mappable was found" in result
+
+    @patch("kosmo.tools.plotter.ISOLATION_AVAILABLE", False)
+    def test_figure_rcparams_set_by_snippet(self):
+        """Test that figure rcParams and styles set by the snippet apply."""
+        snippets = [
+            "plt.rcParams['figure.figsize'] = (12, 3)",
+            "plt.style.use({'figure.figsize': (12, 3)})",
+        ]
+        for setup in snippets:
+            with self.subTest(setup=setup), matplotlib.rc_context():
+                result = create_plot(f"{setup}\nplt.plot([1, 2, 3])", output_dir=self.test_dir)
+                assert "Plot saved successfully" in result
+                with Image.open(result.split(": ", 1)[1]) as image:
+                    assert image.width > 3 * image.height
+
+
+@pytest.mark.parallel_safe
+class TestCreatePlotCosmologyExamples(PlotOutputTestCase):
+    """Tests for cosmology-specific plotting examples."""
 
     def test_hubble_diagram(self):
         """Test creating a Hubble diagram style plot."""
@@ -0,0 +1,40 @@
+"""Tests for the thread ID generator."""
+
+import os
+import uuid
+from unittest.mock import patch
+
+from kosmo.utils import SkidGenerator, new_thread_id
+
+
+class TestSkidGenerator:
+    """Tests for SkidGenerator and new_thread_id."""
+
+    def test_ids_are_valid_uuids(self):
+        """Test that generated IDs parse as version 8 RFC UUIDs."""
+        parsed = uuid.UUID(new_thread_id())
+        assert parsed.version == 8
+        assert parsed.variant == uuid.RFC_4122
+
+    def test_ids_are_unique(self):
+        """Test that many IDs generated back to back never collide."""
+        ids = [new_thread_id() for _ in range(10000)]
+        assert len(set(ids)) == len(ids)
+
+    def test_ids_sort_by_creation(self):
+        """Test that later IDs sort after earlier ones within a process."""
+        generator = SkidGenerator()
+        ids = [str(generator.next()) for _ in range(100)]
+        assert ids == sorted(ids)
+
+    def test_pid_embedded(self):
+        """Test that the process ID is packed into the ID."""
+        value = SkidGenerator().next().int
+        assert (value >> 40) & ((1 << 22) - 1) == os.getpid() & ((1 << 22) - 1)
+
+    def test_reset_after_fork_uses_new_pid(self):
+        """Test that a forked child stops reusing the parent's PID bits."""
+        generator = SkidGenerator()
+        with patch("kosmo.utils.skid.os.getpid", return_value=12345):
+            generator.reset_after_fork()
+        assert (generator.next().int >> 40) & ((1 << 22) - 1) == 12345
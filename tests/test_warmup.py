@@ -0,0 +1,87 @@
+"""Tests for the background warm-up of heavy tool dependencies."""
+
+import sys
+import threading
+from unittest.mock import patch
+
+from kosmo import warmup as warmup_module
+from kosmo.warmup import WARMUP_MODULES, start_warmup, wait_for_warmup, warmup
+
+
+class TestWarmup:
+    """Tests for the warmup function."""
+
+    def test_warmup_idempotent(self):
+        """Test that warmup can be called repeatedly."""
+        warmup()
+        warmup()
+        assert "numpy" in sys.modules
+        assert "sympy" in sys.modules
+
+    def test_warmup_skips_missing_modules(self):
+        """Test that a missing optional module does not raise."""
+        with patch.object(warmup_module, "WARMUP_MODULES", ("kosmo_missing_module",)):
+            warmup()
+
+    def test_warmup_survives_broken_module(self):
+        """Test that a module raising a non-ImportError still lets warm-up finish."""
+        done = threading.Event()
+        calls = []
+
+        def fake_import(name):
+            calls.append(name)
+            if name == "broken":
+                raise RuntimeError("incompatible dependency")
+
+        with patch.object(warmup_module, "WARMUP_MODULES", ("broken", "numpy")), \
+                patch.object(warmup_module, "_done", done), \
+                patch("kosmo.warmup.importlib.import_module", side_effect=fake_import):
+            warmup()
+        assert calls == ["broken", "numpy"]
+        assert done.is_set()
+
+    def test_warmup_modules_listed(self):
+        """Test that only lazily imported dependencies are covered."""
+        assert "sympy" in WARMUP_MODULES
+        assert "langgraph.prebuilt" in WARMUP_MODULES
+        # Already imported eagerly by kosmo.tools
+        for name in ("numpy", "matplotlib", "requests"):
+            assert name not in WARMUP_MODULES
+
+
+class TestStartWarmup:
+    """Tests for starting warm-up on a background thread."""
+
+    def test_starts_once_per_process(self):
+        """Test that only the first call starts a thread."""
+        with patch.object(warmup_module, "_started", False):
+            thread = start_warmup()
+            assert thread is not None
+            assert thread.daemon
+            assert start_warmup() is None
+            thread.join(timeout=30)
+            assert wait_for_warmup(timeout=0)
+
+    def test_wait_without_start_returns_immediately(self):
+        """Test that waiting is a no-op when warm-up never started."""
+        with patch.object(warmup_module, "_started", False):
+            assert wait_for_warmup(timeout=0)
+
+    def test_agent_init_does_not_start_warmup(self):
+        """Test that creating an agent leaves warm-up to the caller."""
+        from kosmo.agent import KosmoAgent
+
+        with patch("kosmo.warmup.start_warmup") as mock_start:
+            KosmoAgent(verbose=False)
+        mock_start.assert_not_called()
+
+    def test_interactive_session_starts_warmup(self, monkeypatch):
+        """Test that the interactive CLI kicks off warm-up."""
+        from kosmo.cli import run_interactive
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        with patch("kosmo.warmup.start_warmup") as mock_start, \
+                patch("builtins.input", side_effect=["quit"]), \
+                patch("builtins.print"):
+            run_interactive(verbose=False)
+        mock_start.assert_called_once()
@@ -2,12 +2,28 @@
 
 import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
-from kosmo.tools.web_search import TAVILY_AVAILABLE, web_search
+from kosmo.tools.web_search import (
+    MAX_CONTENT_CHARS,
+    SEARCH_DOMAINS,
+    TAVILY_AVAILABLE,
+    _get_client,
+    _web_search_impl,
+    _web_search_unavailable,
+    web_search,
+)
 
 
-class TestWebSearchApiKey(unittest.TestCase):
+class WebSearchTestCase(unittest.TestCase):
+    """Base class that drops cached Tavily clients around each test."""
+
+    def setUp(self):
+        _get_client.cache_clear()
+        self.addCleanup(_get_client.cache_clear)
+
+
+class TestWebSearchApiKey(WebSearchTestCase):
     """Tests for API key handling."""
 
     @patch.dict(os.environ, {}, clear=True)
@@ -32,29 +48,41 @@ class TestWebSearchApiKey(unittest.TestCase):
         assert "TAVILY_API_KEY" in result
 
 
-class TestWebSearchPackageAvailability(unittest.TestCase):
+class TestWebSearchPackageAvailability(WebSearchTestCase):
     """Tests for tavily package availability."""
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
-    @patch("kosmo.tools.web_search.TAVILY_AVAILABLE", False)
     def test_tavily_not_installed(self):
         """Test error when tavily-python is not installed."""
-        result = web_search("test query")
+        result = _web_search_unavailable("test query")
 
         assert "Error" in result
         assert "tavily-python" in result
         assert "pip install" in result
 
+    @patch.dict(os.environ, {}, clear=True)
+    def test_tavily_not_installed_reports_missing_key_first(self):
+        """Test that a missing API key is reported before the missing package."""
+        result = _web_search_unavailable("test query")
+
+        assert "TAVILY_API_KEY" in result
+        assert "tavily-python" not in result
+
+    def test_implementation_chosen_at_import(self):
+        """Test that web_search is bound to the implementation matching the install."""
+        expected = _web_search_impl if TAVILY_AVAILABLE else _web_search_unavailable
+        assert web_search is expected
+
 
 @unittest.skipUnless(TAVILY_AVAILABLE, "Tavily package not installed")
-class TestWebSearchWithMockedClient(unittest.TestCase):
+class TestWebSearchWithMockedClient(WebSearchTestCase):
     """Tests for web_search with mocked Tavily client."""
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_successful_search(self, mock_client_class):
         """Test successful search with results."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {
@@ -76,7 +104,7 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_multiple_results(self, mock_client_class):
         """Test search returning multiple results."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {"title": "Result 1", "url": "https://example1.com", "content": "Content 1"},
@@ -96,7 +124,7 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_no_results(self, mock_client_class):
         """Test search with no results."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {"results": []}
         mock_client_class.return_value = mock_client
 
@@ -109,7 +137,7 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_result_formatting(self, mock_client_class):
         """Test that results are properly formatted."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {
@@ -127,12 +155,33 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
         assert "URL: https://test.com/page" in result
         assert "Test content goes here." in result
 
+    @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
+    @patch("kosmo.tools.web_search.TavilyClient")
+    def test_exact_output_layout(self, mock_client_class):
+        """Test the full layout of the formatted results."""
+        mock_client = Mock(spec=["search"])
+        mock_client.search.return_value = {
+            "results": [
+                {"title": "A", "url": "https://a.org", "content": "alpha"},
+                {"title": "B", "url": "https://b.org", "content": "beta"},
+            ]
+        }
+        mock_client_class.return_value = mock_client
+
+        result = web_search("q")
+
+        assert result == (
+            "Search Results for: q\n" + "=" * 50 + "\n\n"
+            "1. A\n   URL: https://a.org\n   alpha\n\n"
+            "2. B\n   URL: https://b.org\n   beta\n\n"
+        )
+
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_content_truncation(self, mock_client_class):
         """Test that long content is truncated."""
         long_content = "x" * 500  # Longer than 300 character limit
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {
@@ -150,12 +199,29 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
         assert "..." in result
         # Should not contain the full 500 characters of content
         assert long_content not in result
+        assert "x" * MAX_CONTENT_CHARS + "..." in result
+
+    @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
+    @patch("kosmo.tools.web_search.TavilyClient")
+    def test_short_content_not_marked_truncated(self, mock_client_class):
+        """Test that content within the limit is shown without an ellipsis."""
+        content = "x" * MAX_CONTENT_CHARS
+        mock_client = Mock(spec=["search"])
+        mock_client.search.return_value = {
+            "results": [{"title": "Test", "url": "https://test.com", "content": content}]
+        }
+        mock_client_class.return_value = mock_client
+
+        result = web_search("test")
+
+        assert content + "\n" in result
+        assert "..." not in result
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_max_results_parameter(self, mock_client_class):
         """Test that max_results parameter is passed to client."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {"results": []}
         mock_client_class.return_value = mock_client
 
@@ -169,7 +235,7 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_search_depth_advanced(self, mock_client_class):
         """Test that search depth is set to advanced."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {"results": []}
         mock_client_class.return_value = mock_client
 
@@ -182,7 +248,7 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_domain_filtering(self, mock_client_class):
         """Test that domain filtering is applied."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {"results": []}
         mock_client_class.return_value = mock_client
 
@@ -196,17 +262,18 @@ class TestWebSearchWithMockedClient(unittest.TestCase):
         assert "esa.int" in include_domains
         assert "wikipedia.org" in include_domains
         assert "space.com" in include_domains
+        assert include_domains is SEARCH_DOMAINS
 
 
 @unittest.skipUnless(TAVILY_AVAILABLE, "Tavily package not installed")
-class TestWebSearchErrorHandling(unittest.TestCase):
+class TestWebSearchErrorHandling(WebSearchTestCase):
     """Tests for error handling in web_search."""
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_api_exception(self, mock_client_class):
         """Test handling of API exception."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.side_effect = Exception("API rate limit exceeded")
         mock_client_class.return_value = mock_client
 
@@ -219,7 +286,7 @@ class TestWebSearchErrorHandling(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_network_error(self, mock_client_class):
         """Test handling of network error."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.side_effect = Exception("Connection refused")
         mock_client_class.return_value = mock_client
 
@@ -231,7 +298,7 @@ class TestWebSearchErrorHandling(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_invalid_api_key(self, mock_client_class):
         """Test handling of invalid API key."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.side_effect = Exception("Invalid API key")
         mock_client_class.return_value = mock_client
 
@@ -241,14 +308,14 @@ class TestWebSearchErrorHandling(unittest.TestCase):
 
 
 @unittest.skipUnless(TAVILY_AVAILABLE, "Tavily package not installed")
-class TestWebSearchMissingFields(unittest.TestCase):
+class TestWebSearchMissingFields(WebSearchTestCase):
     """Tests for handling missing fields in results."""
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test_key"})
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_missing_title(self, mock_client_class):
         """Test handling of missing title in result."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {"url": "https://test.com", "content": "Test content"}
@@ -264,7 +331,7 @@ class TestWebSearchMissingFields(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_missing_url(self, mock_client_class):
         """Test handling of missing URL in result."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {"title": "Test Title", "content": "Test content"}
@@ -280,7 +347,7 @@ class TestWebSearchMissingFields(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_missing_content(self, mock_client_class):
         """Test handling of missing content in result."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {
             "results": [
                 {"title": "Test Title", "url": "https://test.com"}
@@ -296,7 +363,7 @@ class TestWebSearchMissingFields(unittest.TestCase):
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_missing_results_key(self, mock_client_class):
         """Test handling of missing results key in response."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {}
         mock_client_class.return_value = mock_client
 
@@ -305,7 +372,7 @@ class TestWebSearchMissingFields(unittest.TestCase):
         assert "No results found" in result
 
 
-class TestWebSearchAgentIntegration(unittest.TestCase):
+class TestWebSearchAgentIntegration(WebSearchTestCase):
     """Tests for integration with the agent tool system."""
 
     def test_web_search_tool_exists(self):
@@ -335,7 +402,7 @@ class TestWebSearchAgentIntegration(unittest.TestCase):
         assert callable(search_tool.func)
 
 
-class TestWebSearchDefaultParameters(unittest.TestCase):
+class TestWebSearchDefaultParameters(WebSearchTestCase):
     """Tests for default parameter values."""
 
     def test_default_max_results(self):
@@ -348,14 +415,14 @@ class TestWebSearchDefaultParameters(unittest.TestCase):
 
 
 @unittest.skipUnless(TAVILY_AVAILABLE, "Tavily package not installed")
-class TestWebSearchClientInitialization(unittest.TestCase):
+class TestWebSearchClientInitialization(WebSearchTestCase):
     """Tests for Tavily client initialization."""
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "my_secret_key"})
     @patch("kosmo.tools.web_search.TavilyClient")
     def test_client_receives_api_key(self, mock_client_class):
         """Test that TavilyClient receives the API key."""
-        mock_client = MagicMock()
+        mock_client = Mock(spec=["search"])
         mock_client.search.return_value = {"results": []}
         mock_client_class.return_value = mock_client
 
@@ -363,6 +430,32 @@ class TestWebSearchClientInitialization(unittest.TestCase):
 
         mock_client_class.assert_called_once_with(api_key="my_secret_key")
 
+    @patch.dict(os.environ, {"TAVILY_API_KEY": "my_secret_key"})
+    @patch("kosmo.tools.web_search.TavilyClient")
+    def test_client_reused_across_searches(self, mock_client_class):
+        """Test that one client is reused for repeated searches with a key."""
+        mock_client = Mock(spec=["search"])
+        mock_client.search.return_value = {"results": []}
+        mock_client_class.return_value = mock_client
+
+        web_search("first")
+        web_search("second")
+
+        mock_client_class.assert_called_once_with(api_key="my_secret_key")
+        assert mock_client.search.call_count == 2
+
+    @patch("kosmo.tools.web_search.TavilyClient")
+    def test_new_client_for_new_key(self, mock_client_class):
+        """Test that changing the API key creates a new client."""
+        mock_client_class.return_value.search.return_value = {"results": []}
+
+        with patch.dict(os.environ, {"TAVILY_API_KEY": "key_one"}):
+            web_search("test")
+        with patch.dict(os.environ, {"TAVILY_API_KEY": "key_two"}):
+            web_search("test")
+
+        assert mock_client_class.call_count == 2
+
 
 if __name__ == "__main__":
     unittest.main()